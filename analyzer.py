@@ -1,20 +1,181 @@
 """Repository analyzer using GitHub API via MCP."""
+import hashlib
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import requests
-from typing import Optional, Dict, List, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Optional, Dict, List, Set, Tuple
 from datetime import datetime
+from urllib.parse import urlencode
 from models import AnalysisResult, RepoMetadata, FileTreeSummary
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class AnalyzerError(Exception):
     """Custom exception for analyzer errors."""
     pass
 
 
+class _RateLimiter:
+    """Client-side view of GitHub's primary rate limit, tracked per token."""
+    
+    def __init__(self, max_wait: float = 30.0):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_wait: Longest time (seconds) a request may be held back
+                before failing instead
+        """
+        self.max_wait = max_wait
+        # sha256(token) -> (remaining, reset); tokens themselves are never stored
+        self._limits: Dict[Optional[str], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(token: Optional[str]) -> Optional[str]:
+        """Digest identifying a token without keeping the secret in memory."""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest() if token else None
+    
+    def update(self, token: Optional[str], headers) -> None:
+        """
+        Record the X-RateLimit-Remaining / X-RateLimit-Reset headers of a response.
+        
+        Args:
+            token: Token the request was made with (None for anonymous)
+            headers: Response headers
+        """
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset = float(headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+        
+        with self._lock:
+            self._limits[self._key(token)] = (remaining, reset)
+            
+            # Per-request tokens accumulate; forget windows that have reset
+            if len(self._limits) > 1024:
+                now = time.time()
+                self._limits = {t: limit for t, limit in self._limits.items() if limit[1] > now}
+    
+    def wait_time(self, token: Optional[str]) -> float:
+        """
+        Seconds until the token may be used again (0 if it has budget left).
+        
+        Args:
+            token: Token to check (None for anonymous)
+        
+        Returns:
+            Seconds to wait
+        """
+        with self._lock:
+            limit = self._limits.get(self._key(token))
+        
+        if limit is None or limit[0] > 0:
+            return 0.0
+        return max(0.0, limit[1] - time.time())
+    
+    def acquire(self, token: Optional[str]) -> None:
+        """
+        Wait until the token's budget resets if it is exhausted.
+        
+        Args:
+            token: Token about to be used (None for anonymous)
+        
+        Raises:
+            AnalyzerError: If the reset is further away than max_wait
+        """
+        wait = self.wait_time(token)
+        if wait > self.max_wait:
+            raise AnalyzerError(
+                f"GitHub API rate limit exceeded. Remaining: 0. Resets in {int(wait)} seconds. "
+                "Please try again later or provide a GitHub Personal Access Token for higher limits."
+            )
+        if wait > 0:
+            time.sleep(wait)
+
+
+@dataclass
+class _TreeScan:
+    """Everything derived from a single pass over a repository file tree."""
+    manifests: Set[str]
+    marker_techs: Set[str]  # technologies implied by exact file names
+    total_files: int
+    total_dirs: int
+    top_level: Set[str]
+    max_depth: int
+    paths_lower: str  # lowercased blob paths joined by newlines
+
+
+def _build_automaton(patterns: Dict[str, str]):
+    """
+    Build an Aho-Corasick automaton mapping each pattern to its value.
+    
+    Args:
+        patterns: Substring -> value mapping
+    
+    Returns:
+        ahocorasick.Automaton, or None when pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for pattern, value in patterns.items():
+        automaton.add_word(pattern, value)
+    automaton.make_automaton()
+    return automaton
+
+
 class RepositoryAnalyzer:
     """Analyzes GitHub repositories using GitHub API."""
     
     GITHUB_API_BASE = "https://api.github.com"
     
+    # Largest recursive tree body (decompressed) we are willing to download
+    MAX_TREE_BYTES = 5 * 1024 * 1024
+    
+    # Metadata and language breakdown in a single GraphQL request
+    REPOSITORY_QUERY = """
+    query($owner: String!, $name: String!) {
+      repository(owner: $owner, name: $name) {
+        name
+        owner { login }
+        description
+        stargazerCount
+        forkCount
+        defaultBranchRef { name }
+        url
+        languages(first: 50, orderBy: {field: SIZE, direction: DESC}) {
+          totalSize
+          edges { size node { name } }
+        }
+      }
+    }
+    """
+    
+    # Connection pool shared by every analyzer instance in the process
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+    
+    # Rate-limit state shared by every analyzer instance in the process
+    _rate_limiter = _RateLimiter()
+    
     # Package manifest files to detect
     MANIFEST_FILES = {
         'package.json': 'Node.js',
@@ -28,18 +189,218 @@ class RepositoryAnalyzer:
         'Gemfile': 'Ruby',
         'composer.json': 'PHP'
     }
+    _MANIFEST_KEYS = frozenset(MANIFEST_FILES)
     
-    def __init__(self, token: Optional[str] = None):
+    # Framework and database hints matched against lowercased file paths
+    FRAMEWORK_PATTERNS = {
+        'react': 'React',
+        'vue': 'Vue.js',
+        'angular': 'Angular',
+        'flask': 'Flask',
+        'django': 'Django',
+        'express': 'Express.js',
+        'postgres': 'PostgreSQL',
+        'pg': 'PostgreSQL',
+        'mongo': 'MongoDB',
+        'redis': 'Redis'
+    }
+    # Technologies implied by an exact file name anywhere in the tree
+    MARKER_FILES = {
+        'app.py': 'Flask'
+    }
+    _FRAMEWORK_AUTOMATON = _build_automaton(FRAMEWORK_PATTERNS)
+    
+    def __init__(self, token: Optional[str] = None, cache=None,
+                 tokens: Optional[List[str]] = None):
         """
         Initialize analyzer.
         
         Args:
             token: Optional GitHub Personal Access Token for private repos
+            cache: Optional CacheManager used to store ETags for conditional requests
+            tokens: Optional pool of tokens used round-robin, one per request,
+                so N tokens give N times the rate limit (overrides token)
         """
-        self.token = token
+        self.tokens = list(tokens) if tokens else ([token] if token else [])
+        self.token = self.tokens[0] if self.tokens else None
         self.headers = {}
-        if token:
-            self.headers['Authorization'] = f'token {token}'
+        self._token_cycle = itertools.cycle(self.tokens) if self.tokens else None
+        self._token_lock = threading.Lock()
+        self.cache = cache
+        self.session = self._get_session()
+    
+    def _next_token(self) -> Optional[str]:
+        """
+        Take the next token from the pool, skipping exhausted ones.
+        
+        Returns:
+            Token to use, or None when no tokens are configured. If every
+            token is exhausted, the one that resets soonest.
+        """
+        if self._token_cycle is None:
+            return None
+        
+        with self._token_lock:
+            soonest = None
+            for _ in range(len(self.tokens)):
+                token = next(self._token_cycle)
+                wait = self._rate_limiter.wait_time(token)
+                if wait == 0:
+                    return token
+                if soonest is None or wait < soonest[0]:
+                    soonest = (wait, token)
+            return soonest[1]
+    
+    def _request_headers(self, token: Optional[str]) -> Dict[str, str]:
+        """
+        Build headers for one request.
+        
+        Args:
+            token: Token to authenticate with, if any
+        
+        Returns:
+            Headers including Authorization when a token is given
+        """
+        if token is None:
+            return self.headers
+        return {**self.headers, 'Authorization': f'token {token}'}
+    
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """
+        Return the process-wide HTTP session, creating it on first use.
+        
+        The session is shared so that successive analyses reuse keep-alive
+        connections to the GitHub API. Authorization is sent per request
+        rather than stored on the session, since tokens differ per caller.
+        
+        Returns:
+            Shared requests.Session
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.headers['Accept'] = 'application/vnd.github+json'
+                    session.headers['Accept-Encoding'] = 'gzip, deflate'
+                    retry = Retry(
+                        total=3,
+                        backoff_factor=0.5,
+                        status_forcelist=[502, 503, 504],
+                        raise_on_status=False
+                    )
+                    session.mount('https://', HTTPAdapter(
+                        pool_connections=10,
+                        pool_maxsize=20,
+                        max_retries=retry
+                    ))
+                    cls._session = session
+        return cls._session
+    
+    def _get_json(self, url: str, params: Optional[dict] = None, timeout: int = 10,
+                  max_bytes: Optional[int] = None, conditional: bool = True) -> Any:
+        """
+        Perform a conditional GET and return the decoded JSON body.
+        
+        When a previous response for the URL carried an ETag, it is sent as
+        If-None-Match. A 304 reply costs no rate limit and reuses the stored
+        payload.
+        
+        Args:
+            url: API URL
+            params: Optional query parameters
+            timeout: Request timeout in seconds
+            max_bytes: Optional cap on the body size; the body is streamed
+                and the download aborted as soon as it is exceeded
+            conditional: Store the payload with its ETag for later conditional
+                requests; disable for bodies too large to keep around
+        
+        Returns:
+            Decoded JSON payload
+        
+        Raises:
+            AnalyzerError: If the rate limit is exhausted for too long, the
+                body exceeds max_bytes or is not valid JSON
+            requests.exceptions.RequestException: If the request fails
+        """
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        cached = self.cache.get_cached_response(cache_key) if self.cache and conditional else None
+        
+        token = self._next_token()
+        self._rate_limiter.acquire(token)
+        
+        headers = self._request_headers(token)
+        if cached:
+            headers = {**headers, 'If-None-Match': cached[0]}
+        
+        for attempt in range(2):
+            response = self.session.get(url, headers=headers, params=params, timeout=timeout,
+                                        stream=max_bytes is not None)
+            self._rate_limiter.update(token, response.headers)
+            
+            # Secondary rate limits come with Retry-After: wait and retry once
+            retry_after = response.headers.get('Retry-After', '')
+            if (attempt == 0 and response.status_code in (403, 429) and retry_after.isdigit()
+                    and int(retry_after) <= self._rate_limiter.max_wait):
+                response.close()
+                time.sleep(int(retry_after))
+                continue
+            break
+        
+        if response.status_code == 304 and cached:
+            response.close()
+            return cached[1]
+        
+        # A streamed response holds its pooled connection until closed
+        try:
+            response.raise_for_status()
+            content = self._read_limited(response, max_bytes) if max_bytes else response.content
+        finally:
+            response.close()
+        # Recursive trees can be several MB of JSON; orjson decodes them much faster
+        try:
+            data = orjson.loads(content) if orjson else json.loads(content)
+        except ValueError:
+            raise AnalyzerError("GitHub API returned an invalid response. Please try again.")
+        
+        etag = response.headers.get('ETag')
+        if etag and self.cache and conditional:
+            self.cache.cache_response(cache_key, etag, data)
+        
+        return data
+    
+    def _read_limited(self, response: requests.Response, max_bytes: int) -> bytes:
+        """
+        Read a streamed response body, refusing anything over max_bytes.
+        
+        Args:
+            response: Response opened with stream=True
+            max_bytes: Maximum decompressed body size
+        
+        Returns:
+            Body bytes
+        
+        Raises:
+            AnalyzerError: If the body is larger than max_bytes
+        """
+        too_large = "Repository too large for analysis. Try a smaller repository."
+        
+        # Content-Length is the compressed size, so it is a lower bound
+        declared = response.headers.get('Content-Length', '')
+        if declared.isdigit() and int(declared) > max_bytes:
+            response.close()
+            raise AnalyzerError(too_large)
+        
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                response.close()
+                raise AnalyzerError(too_large)
+            chunks.append(chunk)
+        
+        return b''.join(chunks)
     
     def fetch_repo_metadata(self, owner: str, repo: str) -> RepoMetadata:
         """
@@ -58,9 +419,7 @@ class RepositoryAnalyzer:
         url = f"{self.GITHUB_API_BASE}/repos/{owner}/{repo}"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(url)
             
             return RepoMetadata(
                 name=data['name'],
@@ -91,6 +450,71 @@ class RepositoryAnalyzer:
         except requests.exceptions.RequestException as e:
             raise AnalyzerError(f"Network error: {str(e)}")
     
+    def fetch_repository_graphql(self, owner: str, repo: str) -> Tuple[RepoMetadata, Dict[str, float]]:
+        """
+        Fetch repository metadata and languages with one GraphQL request.
+        
+        The GraphQL API requires authentication, so this is only used when
+        a token is available.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+        
+        Returns:
+            Tuple of (RepoMetadata, dictionary of language: percentage)
+        
+        Raises:
+            AnalyzerError: If the request fails or returns errors
+        """
+        url = f"{self.GITHUB_API_BASE}/graphql"
+        payload = {
+            'query': self.REPOSITORY_QUERY,
+            'variables': {'owner': owner, 'name': repo}
+        }
+        
+        try:
+            headers = self._request_headers(self._next_token())
+            response = self.session.post(url, headers=headers, json=payload, timeout=10)
+            response.raise_for_status()
+            data = orjson.loads(response.content) if orjson else response.json()
+        except requests.exceptions.HTTPError as e:
+            raise AnalyzerError(f"GitHub GraphQL API error: {e.response.status_code}")
+        except requests.exceptions.Timeout:
+            raise AnalyzerError("GitHub API request timed out. Please try again.")
+        except requests.exceptions.RequestException as e:
+            raise AnalyzerError(f"Network error: {str(e)}")
+        except ValueError:
+            raise AnalyzerError("GitHub GraphQL API returned an invalid response.")
+        
+        repository = (data.get('data') or {}).get('repository')
+        if data.get('errors') or not repository:
+            raise AnalyzerError("GitHub GraphQL API returned no repository data.")
+        
+        branch_ref = repository.get('defaultBranchRef') or {}
+        repo_meta = RepoMetadata(
+            name=repository['name'],
+            owner=repository['owner']['login'],
+            description=repository.get('description', ''),
+            stars=repository.get('stargazerCount', 0),
+            forks=repository.get('forkCount', 0),
+            default_branch=branch_ref.get('name', 'main'),
+            url=repository['url']
+        )
+        
+        # Convert byte counts to percentages
+        language_data = repository.get('languages') or {}
+        total = language_data.get('totalSize', 0)
+        languages = {}
+        if total:
+            scale = 100.0 / total
+            languages = {
+                edge['node']['name']: edge['size'] * scale
+                for edge in language_data.get('edges', [])
+            }
+        
+        return repo_meta, languages
+    
     def fetch_file_tree(self, owner: str, repo: str, branch: str) -> List[dict]:
         """
         Fetch complete file tree recursively.
@@ -110,9 +534,10 @@ class RepositoryAnalyzer:
         params = {'recursive': '1'}
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
+            # Trees can approach MAX_TREE_BYTES each, too large for the ETag store;
+            # the finished analysis is cached instead
+            data = self._get_json(url, params=params, timeout=15, max_bytes=self.MAX_TREE_BYTES,
+                                  conditional=False)
             
             if data.get('truncated'):
                 raise AnalyzerError("Repository too large for analysis. Try a smaller repository.")
@@ -139,16 +564,15 @@ class RepositoryAnalyzer:
         url = f"{self.GITHUB_API_BASE}/repos/{owner}/{repo}/languages"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(url)
             
             # Convert byte counts to percentages
             total = sum(data.values())
             if total == 0:
                 return {}
             
-            return {lang: (bytes / total) * 100 for lang, bytes in data.items()}
+            scale = 100.0 / total
+            return {lang: size * scale for lang, size in data.items()}
         except Exception:
             # Language data is optional, return empty dict on error
             return {}
@@ -163,14 +587,7 @@ class RepositoryAnalyzer:
         Returns:
             List of manifest filenames found
         """
-        manifests = []
-        for item in file_tree:
-            if item['type'] == 'blob':
-                filename = item['path'].split('/')[-1]
-                if filename in self.MANIFEST_FILES:
-                    manifests.append(filename)
-        
-        return list(set(manifests))  # Remove duplicates
+        return list(self._scan_tree(file_tree).manifests)
     
     def detect_tech_stack(self, file_tree: List[dict], languages: Dict[str, float], 
                          manifests: List[str]) -> List[str]:
@@ -185,46 +602,37 @@ class RepositoryAnalyzer:
         Returns:
             List of detected technologies
         """
-        stack = []
+        return self._detect_stack(self._scan_tree(file_tree), languages, manifests)
+    
+    def _detect_stack(self, scan: _TreeScan, languages: Dict[str, float],
+                      manifests: List[str]) -> List[str]:
+        """Detect technology stack from a completed tree scan."""
+        paths_lower = scan.paths_lower
         
         # Add languages
-        stack.extend(languages.keys())
-        
-        # Add frameworks from manifests
-        for manifest in manifests:
-            if manifest in self.MANIFEST_FILES:
-                tech = self.MANIFEST_FILES[manifest]
-                if tech not in stack:
-                    stack.append(tech)
-        
-        # Detect common frameworks from file patterns
-        file_paths = [item['path'] for item in file_tree if item['type'] == 'blob']
-        
-        # Frontend frameworks
-        if any('react' in path.lower() for path in file_paths):
-            stack.append('React')
-        if any('vue' in path.lower() for path in file_paths):
-            stack.append('Vue.js')
-        if any('angular' in path.lower() for path in file_paths):
-            stack.append('Angular')
-        
-        # Backend frameworks
-        if any('flask' in path.lower() or 'app.py' in path for path in file_paths):
-            stack.append('Flask')
-        if any('django' in path.lower() for path in file_paths):
-            stack.append('Django')
-        if any('express' in path.lower() for path in file_paths):
-            stack.append('Express.js')
-        
-        # Databases
-        if any('postgres' in path.lower() or 'pg' in path.lower() for path in file_paths):
-            stack.append('PostgreSQL')
-        if any('mongo' in path.lower() for path in file_paths):
-            stack.append('MongoDB')
-        if any('redis' in path.lower() for path in file_paths):
-            stack.append('Redis')
-        
-        return list(set(stack))  # Remove duplicates
+        stack = set(languages)
+        
+        # Add frameworks from manifests and marker files
+        stack.update(self.MANIFEST_FILES[m] for m in manifests if m in self.MANIFEST_FILES)
+        stack.update(scan.marker_techs)
+        
+        # Detect common frameworks from file patterns over all lowercased blob
+        # paths: one Aho-Corasick pass when available, else one substring
+        # check per pattern (both see overlapping names like "vuexpress")
+        if self._FRAMEWORK_AUTOMATON is not None:
+            matches = (tech for _, tech in self._FRAMEWORK_AUTOMATON.iter(paths_lower))
+        else:
+            matches = (tech for key, tech in self.FRAMEWORK_PATTERNS.items() if key in paths_lower)
+        
+        remaining = set(self.FRAMEWORK_PATTERNS.values())
+        for tech in matches:
+            if tech in remaining:
+                stack.add(tech)
+                remaining.discard(tech)
+                if not remaining:
+                    break
+        
+        return list(stack)
     
     def analyze_file_tree(self, file_tree: List[dict]) -> FileTreeSummary:
         """
@@ -236,24 +644,64 @@ class RepositoryAnalyzer:
         Returns:
             FileTreeSummary object
         """
-        files = [item for item in file_tree if item['type'] == 'blob']
-        dirs = [item for item in file_tree if item['type'] == 'tree']
+        return self._summarize_scan(self._scan_tree(file_tree))
+    
+    def _summarize_scan(self, scan: _TreeScan) -> FileTreeSummary:
+        """Build a FileTreeSummary from a completed tree scan."""
+        return FileTreeSummary(
+            total_files=scan.total_files,
+            total_dirs=scan.total_dirs,
+            top_level_structure=sorted(scan.top_level)[:20],  # Limit to 20 items
+            max_depth=scan.max_depth
+        )
+    
+    def _scan_tree(self, file_tree: List[dict]) -> _TreeScan:
+        """
+        Walk the file tree once and collect everything the analysis needs.
         
-        # Get top-level structure
-        top_level = set()
-        for item in file_tree:
-            parts = item['path'].split('/')
-            if len(parts) > 0:
-                top_level.add(parts[0] + ('/' if len(parts) > 1 else ''))
+        Args:
+            file_tree: List of file objects from GitHub API
         
-        # Calculate max depth
-        max_depth = max((len(item['path'].split('/')) for item in file_tree), default=0)
+        Returns:
+            _TreeScan with manifests, counts, top-level entries, depth and
+            the lowercased blob paths used for framework detection
+        """
+        manifests = set()
+        marker_techs = set()
+        top_level = set()
+        blob_paths = []
+        total_dirs = 0
+        max_depth = 0
         
-        return FileTreeSummary(
-            total_files=len(files),
-            total_dirs=len(dirs),
-            top_level_structure=sorted(list(top_level))[:20],  # Limit to 20 items
-            max_depth=max_depth
+        for item in file_tree:
+            path = item['path']
+            
+            # Top-level entry, with a trailing slash when it has children
+            slash = path.find('/')
+            top_level.add(path if slash < 0 else path[:slash + 1])
+            
+            depth = path.count('/') + 1
+            if depth > max_depth:
+                max_depth = depth
+            
+            if item['type'] == 'blob':
+                blob_paths.append(path)
+                filename = path.rpartition('/')[2]
+                if filename in self._MANIFEST_KEYS:
+                    manifests.add(filename)
+                elif filename in self.MARKER_FILES:
+                    marker_techs.add(self.MARKER_FILES[filename])
+            elif item['type'] == 'tree':
+                total_dirs += 1
+        
+        return _TreeScan(
+            manifests=manifests,
+            marker_techs=marker_techs,
+            total_files=len(blob_paths),
+            total_dirs=total_dirs,
+            top_level=top_level,
+            max_depth=max_depth,
+            paths_lower='\n'.join(blob_paths).lower()
         )
     
     def suggest_setup_steps(self, manifests: List[str], languages: Dict[str, float]) -> List[str]:
@@ -313,23 +761,46 @@ class RepositoryAnalyzer:
         Raises:
             AnalyzerError: If analysis fails
         """
-        # Fetch metadata
-        repo_meta = self.fetch_repo_metadata(owner, repo)
-        
-        # Fetch file tree
-        file_tree = self.fetch_file_tree(owner, repo, repo_meta.default_branch)
-        
-        # Fetch languages
-        languages = self.fetch_languages(owner, repo)
+        overview = None
+        if self.token:
+            try:
+                # Metadata and languages in a single request
+                overview = self.fetch_repository_graphql(owner, repo)
+            except AnalyzerError:
+                # Fall back to REST, which also gives precise error messages
+                overview = None
+        
+        if overview is not None:
+            repo_meta, languages = overview
+            
+            # Fetch file tree
+            file_tree = self.fetch_file_tree(owner, repo, repo_meta.default_branch)
+        else:
+            # Languages don't depend on the default branch, so fetch them in the
+            # background while metadata and then the file tree are requested.
+            # This keeps at most two requests in flight per analysis.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                languages_future = executor.submit(self.fetch_languages, owner, repo)
+                
+                # Fetch metadata
+                repo_meta = self.fetch_repo_metadata(owner, repo)
+                
+                # Fetch file tree
+                file_tree = self.fetch_file_tree(owner, repo, repo_meta.default_branch)
+                
+                languages = languages_future.result()
+        
+        # Scan the file tree once for manifests, structure and path hints
+        scan = self._scan_tree(file_tree)
         
         # Identify manifests
-        manifests = self.identify_package_manifests(file_tree)
+        manifests = list(scan.manifests)
         
         # Detect tech stack
-        detected_stack = self.detect_tech_stack(file_tree, languages, manifests)
+        detected_stack = self._detect_stack(scan, languages, manifests)
         
         # Analyze file tree
-        file_tree_summary = self.analyze_file_tree(file_tree)
+        file_tree_summary = self._summarize_scan(scan)
         
         # Generate hints
         hints = self.suggest_setup_steps(manifests, languages)
@@ -1,24 +1,58 @@
 """Flask API server for GitRefiny."""
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from datetime import datetime
+import json
 import os
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+# Load environment variables before the modules below read them at import time
+load_dotenv()
+
 from validators import validate_github_url, ValidationError
 from analyzer import RepositoryAnalyzer, AnalyzerError
 from generator import READMEGenerator, GeneratorError
 from cache import cache_manager
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 CORS(app)
 
 # Initialize components
 readme_generator = READMEGenerator()
 
+# Shared analyzer for requests without their own token, so token rotation
+# carries across requests. GITHUB_TOKENS takes a comma-separated pool.
+github_tokens = [
+    t.strip() for t in os.getenv('GITHUB_TOKENS', os.getenv('GITHUB_TOKEN', '')).split(',')
+    if t.strip()
+]
+default_analyzer = RepositoryAnalyzer(tokens=github_tokens, cache=cache_manager)
+
+# Keep-alive connection pool for chat requests to Groq
+groq_session = requests.Session()
+groq_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=8))
+
 
 @app.route('/')
 def index():
@@ -52,8 +86,7 @@ def analyze_repository():
             }), 400
         
         repo_url = data['repo_url']
-        # Use token from request, or fall back to environment variable
-        token = data.get('token') or os.getenv('GITHUB_TOKEN')
+        token = data.get('token')
         
         # Validate URL
         try:
@@ -71,8 +104,12 @@ def analyze_repository():
         if cached_result:
             return jsonify(cached_result.to_dict()), 200
         
-        # Analyze repository with token
-        analyzer = RepositoryAnalyzer(token=token)
+        # Analyze repository with the caller's token, or fall back to the
+        # token pool from the environment
+        if token:
+            analyzer = RepositoryAnalyzer(token=token, cache=cache_manager)
+        else:
+            analyzer = default_analyzer
         
         try:
             analysis = analyzer.analyze_repository(owner, repo)
@@ -127,7 +164,8 @@ def generate_readme():
             "repo_url": "https://github.com/owner/repo",
             "sections": ["title", "description", ...],  // optional
             "tone": "professional",  // optional
-            "model": "Auto"  // optional
+            "model": "Auto",  // optional
+            "regenerate": false  // optional, skip previously cached completions
         }
     
     Returns:
@@ -151,6 +189,7 @@ def generate_readme():
         sections = data.get('sections')
         tone = data.get('tone', 'professional')
         model = data.get('model', 'Auto')
+        regenerate = bool(data.get('regenerate'))
         
         # Get analysis from cache
         analysis = cache_manager.get_cached_analysis(repo_url)
@@ -169,7 +208,8 @@ def generate_readme():
                 analysis=analysis,
                 sections=sections,
                 tone=tone,
-                model=model
+                model=model,
+                bypass_cache=regenerate
             )
         except GeneratorError as e:
             return jsonify({
@@ -202,17 +242,19 @@ def chat_assistant():
     Request body:
         {
             "message": "user message",
-            "context": "optional context about current README"
+            "context": "optional context about current README",
+            "stream": false  // optional
         }
     
     Returns:
         {
             "response": "AI assistant response"
         }
+        
+        With "stream": true, a text/event-stream instead, where each event is
+        `data: {"response": "<partial text>"}` and the last is `data: [DONE]`.
     """
     try:
-        import requests
-        
         data = request.get_json()
         
         if not data or 'message' not in data:
@@ -225,6 +267,7 @@ def chat_assistant():
         
         user_message = data.get('message', '').strip()
         context = data.get('context', '')
+        stream = bool(data.get('stream'))
         
         # Limit message length to prevent token overflow (max 500 chars)
         if len(user_message) > 500:
@@ -294,13 +337,15 @@ If asked about non-README topics, politely redirect to README-related help."""
                 }
             ],
             "max_tokens": 500,  # Limit response length
-            "temperature": 0.7
+            "temperature": 0.7,
+            "stream": stream
         }
         
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = groq_session.post(url, headers=headers, json=payload, timeout=30, stream=stream)
         
         if response.status_code != 200:
             error_detail = response.text
+            response.close()
             print(f"Groq API error: {error_detail}")
             
             if response.status_code == 429:
@@ -318,6 +363,12 @@ If asked about non-README topics, politely redirect to README-related help."""
                 }
             }), 500
         
+        if stream:
+            return Response(
+                stream_with_context(_relay_chat_stream(response)),
+                mimetype='text/event-stream'
+            )
+        
         result = response.json()
         
         # Extract response
@@ -352,6 +403,40 @@ If asked about non-README topics, politely redirect to README-related help."""
         }), 500
 
 
+def _relay_chat_stream(response):
+    """
+    Re-emit a streamed Groq completion as server-sent events.
+    
+    Args:
+        response: Streaming requests.Response from the Groq API
+    
+    Yields:
+        SSE `data:` lines carrying partial assistant text
+    """
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data: '):
+                continue
+            
+            chunk = line[len('data: '):]
+            if chunk == '[DONE]':
+                break
+            
+            choices = json.loads(chunk).get('choices') or [{}]
+            content = choices[0].get('delta', {}).get('content')
+            if content:
+                yield f"data: {json.dumps({'response': content})}\n\n"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # Network failure or an undecodable event from upstream
+        print(f"Chat stream error: {str(e)}")
+        error = {'error': {'code': 'STREAM_ERROR', 'message': 'The response stream was interrupted'}}
+        yield f"data: {json.dumps(error)}\n\n"
+    finally:
+        response.close()
+    
+    yield "data: [DONE]\n\n"
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
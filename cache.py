@@ -1,22 +1,51 @@
-"""Simple in-memory cache for repository analysis results."""
-from typing import Optional, Dict
+"""Two-tier (memory + optional disk) cache for repository analysis results."""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 from datetime import datetime, timedelta
 from models import AnalysisResult
-import hashlib
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 
 class CacheManager:
-    """Manages caching of analysis results with TTL."""
+    """Manages caching of analysis results with TTL and LRU eviction."""
     
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(self, ttl_seconds: int = 3600, max_size: int = 256,
+                 cache_dir: Optional[str] = None, response_ttl_seconds: int = 86400):
         """
         Initialize cache manager.
         
         Args:
             ttl_seconds: Time-to-live for cache entries (default 1 hour)
+            max_size: Maximum number of analyses kept in memory before evicting
+                the least recently used (API responses are capped at 2x this,
+                one each for metadata and languages)
+            cache_dir: Optional directory for a persistent disk tier shared
+                across restarts and worker processes (ignored when diskcache
+                is not installed)
+            response_ttl_seconds: How long API responses are kept on disk for
+                conditional requests (default 1 day)
         """
-        self.cache: Dict[str, tuple] = {}  # key -> (result, expiry_time)
+        self.cache: OrderedDict = OrderedDict()  # key -> (result, expiry_time)
+        self.responses: OrderedDict = OrderedDict()  # API URL -> (etag, payload)
         self.ttl = timedelta(seconds=ttl_seconds)
+        self.response_ttl = timedelta(seconds=response_ttl_seconds)
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self.disk = diskcache.Cache(cache_dir) if cache_dir and diskcache is not None else None
+    
+    def _remember(self, store: OrderedDict, key: str, value: tuple, limit: int) -> None:
+        """Insert into an in-memory LRU store, evicting the oldest entry if full."""
+        with self._lock:
+            store[key] = value
+            store.move_to_end(key)
+            if len(store) > limit:
+                store.popitem(last=False)
     
     def _generate_key(self, repo_url: str) -> str:
         """
@@ -26,9 +55,9 @@ class CacheManager:
             repo_url: Repository URL
         
         Returns:
-            Cache key (hash of URL)
+            Cache key (normalized URL)
         """
-        return hashlib.md5(repo_url.lower().encode()).hexdigest()
+        return repo_url.strip().rstrip('/').lower()
     
     def get_cached_analysis(self, repo_url: str) -> Optional[AnalysisResult]:
         """
@@ -42,15 +71,26 @@ class CacheManager:
         """
         key = self._generate_key(repo_url)
         
-        if key not in self.cache:
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.cache.move_to_end(key)
+        
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(f'analysis:{key}')
+            if entry is not None:
+                self._remember(self.cache, key, entry, self.max_size)
+        
+        if entry is None:
             return None
         
-        result, expiry_time = self.cache[key]
+        result, expiry_time = entry
         
         # Check if expired
         if datetime.now() > expiry_time:
             # Remove expired entry
-            del self.cache[key]
+            with self._lock:
+                self.cache.pop(key, None)
             return None
         
         return result
@@ -65,7 +105,11 @@ class CacheManager:
         """
         key = self._generate_key(repo_url)
         expiry_time = datetime.now() + self.ttl
-        self.cache[key] = (analysis, expiry_time)
+        entry = (analysis, expiry_time)
+        
+        self._remember(self.cache, key, entry, self.max_size)
+        if self.disk is not None:
+            self.disk.set(f'analysis:{key}', entry, expire=self.ttl.total_seconds())
     
     def invalidate_cache(self, repo_url: str) -> None:
         """
@@ -75,12 +119,58 @@ class CacheManager:
             repo_url: Repository URL
         """
         key = self._generate_key(repo_url)
-        if key in self.cache:
-            del self.cache[key]
+        with self._lock:
+            self.cache.pop(key, None)
+        if self.disk is not None:
+            self.disk.delete(f'analysis:{key}')
+    
+    def get_cached_response(self, api_url: str) -> Optional[Tuple[str, Any]]:
+        """
+        Retrieve the last ETag and payload seen for a GitHub API URL.
+        
+        Entries are only reused after GitHub confirms with a 304 that the
+        resource is unchanged, so staleness is not a concern; the disk copy
+        still expires after response_ttl to bound its size.
+        
+        Args:
+            api_url: GitHub API URL (including query string)
+        
+        Returns:
+            Tuple of (etag, payload) if known, None otherwise
+        """
+        with self._lock:
+            entry = self.responses.get(api_url)
+            if entry is not None:
+                self.responses.move_to_end(api_url)
+                return entry
+        
+        if self.disk is not None:
+            entry = self.disk.get(f'response:{api_url}')
+            if entry is not None:
+                self._remember(self.responses, api_url, entry, self.max_size * 2)
+        return entry
+    
+    def cache_response(self, api_url: str, etag: str, payload: Any) -> None:
+        """
+        Store an API payload together with its ETag.
+        
+        Args:
+            api_url: GitHub API URL (including query string)
+            etag: ETag header returned by GitHub
+            payload: Decoded JSON payload
+        """
+        entry = (etag, payload)
+        self._remember(self.responses, api_url, entry, self.max_size * 2)
+        if self.disk is not None:
+            self.disk.set(f'response:{api_url}', entry, expire=self.response_ttl.total_seconds())
     
     def clear_all(self) -> None:
         """Clear all cache entries."""
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
+            self.responses.clear()
+        if self.disk is not None:
+            self.disk.clear()
     
     def cleanup_expired(self) -> int:
         """
@@ -90,16 +180,21 @@ class CacheManager:
             Number of entries removed
         """
         now = datetime.now()
-        expired_keys = [
-            key for key, (_, expiry) in self.cache.items()
-            if now > expiry
-        ]
+        with self._lock:
+            expired_keys = [
+                key for key, (_, expiry) in self.cache.items()
+                if now > expiry
+            ]
+            
+            for key in expired_keys:
+                del self.cache[key]
         
-        for key in expired_keys:
-            del self.cache[key]
+        removed = len(expired_keys)
+        if self.disk is not None:
+            removed += self.disk.expire()
         
-        return len(expired_keys)
+        return removed
 
 
-# Global cache instance
-cache_manager = CacheManager()
+# Global cache instance; set GITREFINY_CACHE_DIR to persist it on disk
+cache_manager = CacheManager(cache_dir=os.getenv('GITREFINY_CACHE_DIR'))
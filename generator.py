@@ -1,189 +1,184 @@
 """README generator using AI models."""
-from typing import List, Optional, Dict
+from typing import Dict, Iterator, List, Optional, Union
 from models import AnalysisResult
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain, islice
+import hashlib
+import heapq
 import os
-import requests
-import json
+import random
+import re
+import threading
+import logging
+from operator import itemgetter
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class GeneratorError(Exception):
-    """Custom exception for generator errors."""
-    pass
+logger = logging.getLogger(__name__)
 
 
-class READMEGenerator:
-    """Generates README content using external AI APIs."""
-    
-    # Default sections for README
-    DEFAULT_SECTIONS = [
-        'title', 'description', 'features', 'architecture',
-        'file_structure', 'tech_stack', 'setup', 'usage',
-        'api_endpoints', 'contributing'
-    ]
-    
-    # API Configuration - FREE TIER APIs
-    GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
-    
-    def __init__(self):
-        """Initialize README generator."""
-        self.use_ai = bool(self.GROQ_API_KEY)
+@lru_cache(maxsize=1)
+def _get_requests():
+    """
+    Import requests on first use.
     
+    The template fallback never touches the network, so the cost of importing
+    requests (urllib3, certifi, charset_normalizer) is only paid by Groq calls.
+    """
+    import requests
+    return requests
+
 
+@lru_cache(maxsize=None)
+def _bounded_retry_class(max_retry_after: float):
+    """
+    Build a urllib3 Retry subclass that gives up on long Retry-After waits.
     
-    def _call_groq_api(self, prompt: str) -> str:
-        """
-        Call Groq API with Llama 3 for README generation (FREE TIER).
-        
-        Args:
-            prompt: The prompt with repository analysis
-        
-        Returns:
-            Generated README markdown
-        """
-        if not self.GROQ_API_KEY:
-            raise GeneratorError("Groq API key not configured")
-        
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": "llama-3.3-70b-versatile",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are an expert technical writer who creates beautiful, comprehensive README files for GitHub repositories."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": 8000,
-            "temperature": 0.7
-        }
-        
-        try:
-            print("Calling Groq API with Llama 3.3 70B...")
-            response = requests.post(url, headers=headers, json=data, timeout=60)
-            
-            # Log response status
-            print(f"Groq API response status: {response.status_code}")
-            
-            if response.status_code != 200:
-                error_detail = response.text
-                print(f"Groq API error response: {error_detail}")
-                
-                # Handle specific error codes
-                if response.status_code == 429:
-                    raise GeneratorError("Groq API rate limit exceeded. Please wait a few minutes and try again.")
-                elif response.status_code == 401:
-                    raise GeneratorError("Groq API key is invalid or expired. Please check your API key.")
-                elif response.status_code == 403:
-                    raise GeneratorError("Groq API access forbidden. Please check your API key permissions.")
-                else:
-                    raise GeneratorError(f"Groq API returned {response.status_code}: {error_detail}")
-            
-            result = response.json()
-            
-            # Check if response has expected structure
-            if 'choices' not in result or not result['choices']:
-                raise GeneratorError(f"Groq API returned unexpected response structure: {result}")
-            
-            content = result['choices'][0]['message']['content']
-            print(f"Groq API success! Generated {len(content)} characters")
-            return content
-            
-        except requests.exceptions.Timeout:
-            raise GeneratorError("Groq API request timed out after 60 seconds")
-        except requests.exceptions.ConnectionError:
-            raise GeneratorError("Failed to connect to Groq API. Check your internet connection.")
-        except requests.exceptions.RequestException as e:
-            raise GeneratorError(f"Groq API request failed: {str(e)}")
-        except KeyError as e:
-            raise GeneratorError(f"Groq API response missing expected field: {str(e)}")
-        except Exception as e:
-            raise GeneratorError(f"Groq API error: {str(e)}")
+    A Retry-After beyond max_retry_after ends the retries at once, so the
+    throttled response is handed back instead of sleeping through it.
+    """
+    from urllib3.exceptions import MaxRetryError
+    from urllib3.util.retry import Retry
     
-    def build_prompt(self, analysis: AnalysisResult, sections: Optional[List[str]] = None,
-                    tone: str = 'professional') -> str:
-        """
-        Build comprehensive AI prompt from analysis data.
-        
-        Args:
-            analysis: Repository analysis result
-            sections: List of sections to include (None = all)
-            tone: Tone for content (professional/concise/enthusiastic)
-        
-        Returns:
-            Formatted prompt string for AI
-        """
-        if sections is None:
-            sections = self.DEFAULT_SECTIONS
-        
-        # Tone instructions
-        tone_instructions = {
-            'professional': 'Use a professional, technical tone suitable for enterprise documentation.',
-            'concise': 'Be brief and to-the-point. Use short sentences and bullet points.',
-            'enthusiastic': 'Use an enthusiastic, engaging tone that excites developers about the project.'
-        }
-        
-        tone_instruction = tone_instructions.get(tone, tone_instructions['professional'])
-        
-        # Format languages with percentages
-        languages_text = ""
-        if analysis.languages:
-            sorted_langs = sorted(analysis.languages.items(), key=lambda x: x[1], reverse=True)
-            languages_text = "\n".join([f"- {lang}: {pct:.1f}%" for lang, pct in sorted_langs[:5]])
-        
-        # Format tech stack
-        tech_stack_text = ", ".join(analysis.detected_stack) if analysis.detected_stack else "Not detected"
-        
-        # Format file structure
-        file_structure_text = "\n".join(analysis.file_tree_summary.top_level_structure[:20])
-        
-        # Build comprehensive prompt
-        prompt = f"""You are an expert technical writer creating a beautiful, professional README.md for a GitHub repository.
-
-REPOSITORY INFORMATION:
-- Name: {analysis.repo_meta.name}
-- Owner: {analysis.repo_meta.owner}
-- Description: {analysis.repo_meta.description}
-- Stars: {analysis.repo_meta.stars}
-- Forks: {analysis.repo_meta.forks}
-- URL: {analysis.repo_meta.url}
-
-PROGRAMMING LANGUAGES:
-{languages_text}
-
-DETECTED TECH STACK:
-{tech_stack_text}
-
-PACKAGE MANIFESTS FOUND:
-{', '.join(analysis.package_manifests) if analysis.package_manifests else 'None'}
+    class BoundedRetry(Retry):
+        def increment(self, method=None, url=None, response=None, error=None,
+                      _pool=None, _stacktrace=None):
+            if response is not None and self.respect_retry_after_header:
+                retry_after = self.get_retry_after(response)
+                if retry_after is not None and retry_after > max_retry_after:
+                    raise MaxRetryError(_pool, url, None)
+            return super().increment(method, url, response, error, _pool, _stacktrace)
+    
+    return BoundedRetry
 
-FILE STRUCTURE (Top Level):
-{file_structure_text}
 
-PROJECT STATISTICS:
-- Total Files: {analysis.file_tree_summary.total_files}
-- Total Directories: {analysis.file_tree_summary.total_dirs}
-- Max Depth: {analysis.file_tree_summary.max_depth}
+def _encode_json(data) -> bytes:
+    """Serialize a request body, with orjson when available."""
+    if orjson:
+        return orjson.dumps(data)
+    import json
+    return json.dumps(data).encode('utf-8')
 
-SETUP HINTS:
-{chr(10).join(analysis.hints)}
 
-INSTRUCTIONS:
-{tone_instruction}
+def _decode_json(raw: bytes):
+    """Parse a response body, with orjson when available."""
+    if orjson:
+        return orjson.loads(raw)
+    import json
+    return json.loads(raw)
 
-IMPORTANT - MERMAID ARCHITECTURE DIAGRAMS:
-You MUST create detailed, professional Mermaid diagrams that will render as VISUAL FLOWCHARTS.
 
-**CRITICAL: Use PROPER Mermaid syntax - diagrams will render as visual graphics on GitHub!**
-
-**Example 1 - Full Stack Web App:**
+def _format_tree(items: List[str], root: str, limit: int, more: str) -> str:
+    """
+    Render top-level entries as a fenced ASCII file tree.
+    
+    Args:
+        items: Entry names, in display order
+        root: Label for the root line
+        limit: Maximum number of entries to show
+        more: Label for the final line when entries were cut off
+    
+    Returns:
+        Markdown code block containing the tree
+    """
+    truncated = len(items) > limit
+    shown = items[:limit]
+    last = len(shown) - 1 if not truncated else -1
+    body = "\n".join(("└── " if i == last else "├── ") + item for i, item in enumerate(shown))
+    tail = f"\n└── {more}" if truncated else ""
+    return f"```\n{root}\n{body}{tail}\n```" if shown else f"```\n{root}\n```"
+
+
+# Emoji labels for the template fallback's tech stack, matched by substring
+# in this order (so 'javascript' wins over 'java')
+_TECH_ICONS = {
+    'javascript': '🟨 JavaScript',
+    'typescript': '🔷 TypeScript',
+    'python': '🐍 Python',
+    'java': '☕ Java',
+    'go': '🐹 Go',
+    'rust': '🦀 Rust',
+    'ruby': '💎 Ruby',
+    'php': '🐘 PHP',
+    'html': '🌐 HTML',
+    'css': '🎨 CSS',
+    'react': '⚛️ React',
+    'vue': '💚 Vue.js',
+    'node': '🟢 Node.js',
+    'flask': '🌶️ Flask',
+    'django': '🎸 Django',
+    'postgres': '🐘 PostgreSQL',
+    'mongo': '🍃 MongoDB',
+    'docker': '🐳 Docker',
+}
+_TECH_KEYS = tuple(_TECH_ICONS)
+
+
+def _tech_label(tech: str) -> str:
+    """Emoji label for a technology, or a generic one if it is not in _TECH_ICONS."""
+    tech_lower = tech.lower()
+    key = next((k for k in _TECH_KEYS if k in tech_lower), None)
+    return _TECH_ICONS[key] if key else f"🔧 {tech}"
+
+
+# shields.io badge line per technology, keyed by lowercased stack or language
+# name; build_prompt lists only the ones matching the analysis
+_BADGE_TABLE = {
+    'react': "- ![React](https://img.shields.io/badge/React-20232A?style=for-the-badge&logo=react&logoColor=61DAFB)",
+    'vue.js': "- ![Vue.js](https://img.shields.io/badge/Vue.js-35495E?style=for-the-badge&logo=vue.js&logoColor=4FC08D)",
+    'vue': "- ![Vue.js](https://img.shields.io/badge/Vue.js-35495E?style=for-the-badge&logo=vue.js&logoColor=4FC08D)",
+    'angular': "- ![Angular](https://img.shields.io/badge/Angular-DD0031?style=for-the-badge&logo=angular&logoColor=white)",
+    'html': "- ![HTML5](https://img.shields.io/badge/HTML5-E34F26?style=for-the-badge&logo=html5&logoColor=white)",
+    'html5': "- ![HTML5](https://img.shields.io/badge/HTML5-E34F26?style=for-the-badge&logo=html5&logoColor=white)",
+    'css': "- ![CSS3](https://img.shields.io/badge/CSS3-1572B6?style=for-the-badge&logo=css3&logoColor=white)",
+    'css3': "- ![CSS3](https://img.shields.io/badge/CSS3-1572B6?style=for-the-badge&logo=css3&logoColor=white)",
+    'javascript': "- ![JavaScript](https://img.shields.io/badge/JavaScript-F7DF1E?style=for-the-badge&logo=javascript&logoColor=black)",
+    'typescript': "- ![TypeScript](https://img.shields.io/badge/TypeScript-007ACC?style=for-the-badge&logo=typescript&logoColor=white)",
+    'tailwind css': "- ![Tailwind CSS](https://img.shields.io/badge/Tailwind_CSS-38B2AC?style=for-the-badge&logo=tailwind-css&logoColor=white)",
+    'tailwind': "- ![Tailwind CSS](https://img.shields.io/badge/Tailwind_CSS-38B2AC?style=for-the-badge&logo=tailwind-css&logoColor=white)",
+    'node.js': "- ![Node.js](https://img.shields.io/badge/Node.js-43853D?style=for-the-badge&logo=node.js&logoColor=white)",
+    'node': "- ![Node.js](https://img.shields.io/badge/Node.js-43853D?style=for-the-badge&logo=node.js&logoColor=white)",
+    'python': "- ![Python](https://img.shields.io/badge/Python-3776AB?style=for-the-badge&logo=python&logoColor=white)",
+    'flask': "- ![Flask](https://img.shields.io/badge/Flask-000000?style=for-the-badge&logo=flask&logoColor=white)",
+    'django': "- ![Django](https://img.shields.io/badge/Django-092E20?style=for-the-badge&logo=django&logoColor=white)",
+    'express.js': "- ![Express.js](https://img.shields.io/badge/Express.js-404D59?style=for-the-badge&logo=express&logoColor=white)",
+    'express': "- ![Express.js](https://img.shields.io/badge/Express.js-404D59?style=for-the-badge&logo=express&logoColor=white)",
+    'fastapi': "- ![FastAPI](https://img.shields.io/badge/FastAPI-005571?style=for-the-badge&logo=fastapi&logoColor=white)",
+    'go': "- ![Go](https://img.shields.io/badge/Go-00ADD8?style=for-the-badge&logo=go&logoColor=white)",
+    'java': "- ![Java](https://img.shields.io/badge/Java-ED8B00?style=for-the-badge&logo=openjdk&logoColor=white)",
+    'java/maven': "- ![Java](https://img.shields.io/badge/Java-ED8B00?style=for-the-badge&logo=openjdk&logoColor=white)",
+    'java/gradle': "- ![Java](https://img.shields.io/badge/Java-ED8B00?style=for-the-badge&logo=openjdk&logoColor=white)",
+    'ruby': "- ![Ruby](https://img.shields.io/badge/Ruby-CC342D?style=for-the-badge&logo=ruby&logoColor=white)",
+    'php': "- ![PHP](https://img.shields.io/badge/PHP-777BB4?style=for-the-badge&logo=php&logoColor=white)",
+    'postgresql': "- ![PostgreSQL](https://img.shields.io/badge/PostgreSQL-316192?style=for-the-badge&logo=postgresql&logoColor=white)",
+    'mongodb': "- ![MongoDB](https://img.shields.io/badge/MongoDB-4EA94B?style=for-the-badge&logo=mongodb&logoColor=white)",
+    'mysql': "- ![MySQL](https://img.shields.io/badge/MySQL-00000F?style=for-the-badge&logo=mysql&logoColor=white)",
+    'redis': "- ![Redis](https://img.shields.io/badge/Redis-DC382D?style=for-the-badge&logo=redis&logoColor=white)",
+    'sqlite': "- ![SQLite](https://img.shields.io/badge/SQLite-07405E?style=for-the-badge&logo=sqlite&logoColor=white)",
+    'docker': "- ![Docker](https://img.shields.io/badge/Docker-2496ED?style=for-the-badge&logo=docker&logoColor=white)",
+    'dockerfile': "- ![Docker](https://img.shields.io/badge/Docker-2496ED?style=for-the-badge&logo=docker&logoColor=white)",
+    'kubernetes': "- ![Kubernetes](https://img.shields.io/badge/Kubernetes-326CE5?style=for-the-badge&logo=kubernetes&logoColor=white)",
+    'git': "- ![Git](https://img.shields.io/badge/Git-F05032?style=for-the-badge&logo=git&logoColor=white)",
+    'github': "- ![GitHub](https://img.shields.io/badge/GitHub-100000?style=for-the-badge&logo=github&logoColor=white)",
+    'aws': "- ![AWS](https://img.shields.io/badge/AWS-232F3E?style=for-the-badge&logo=amazon-aws&logoColor=white)",
+    'firebase': "- ![Firebase](https://img.shields.io/badge/Firebase-FFCA28?style=for-the-badge&logo=firebase&logoColor=black)"
+}
+_DEFAULT_BADGE = _BADGE_TABLE['github']
+
+# Technology names (lowercased) that place a repository in each layer
+_FRONTEND_TECHS = frozenset({'react', 'vue', 'vue.js', 'angular', 'html', 'svelte', 'next.js'})
+_BACKEND_TECHS = frozenset({'flask', 'django', 'express', 'express.js', 'node', 'node.js', 'fastapi', 'spring'})
+_DATABASE_TECHS = frozenset({
+    'postgresql', 'mongodb', 'mysql', 'mariadb', 'redis', 'sqlite',
+    'sql', 'plpgsql', 'plsql', 'sqlpl', 'tsql'
+})
+
+# Example Mermaid diagram shown to the model, chosen by detected topology
+_FULL_STACK_EXAMPLE = """**Example - Full Stack Web App:**
 Use this Mermaid syntax (with triple backticks):
 graph TB
     A[User/Browser] -->|HTTP Request| B[Frontend<br/>React/HTML/CSS/JS]
@@ -196,28 +191,12 @@ graph TB
     style A fill:#e1f5ff
     style B fill:#fff3e0
     style C fill:#f3e5f5
-    style D fill:#e8f5e9
+    style D fill:#e8f5e9"""
 
-**Example 2 - Detailed Full Stack with Styling:**
-Use this Mermaid syntax (with triple backticks):
-flowchart TD
-    Start([User Login]) --> Survey[Takes Career Survey]
-    Survey --> Analysis[AI: Analyze Profile]
-    Analysis --> Suggestions[AI Career Suggestions<br/>3 Categories]
-    Suggestions --> Display[Display Results]
-    Display --> End([User Reviews])
-    
-    style Start fill:#4CAF50,stroke:#2E7D32,color:#fff
-    style Survey fill:#2196F3,stroke:#1565C0,color:#fff
-    style Analysis fill:#9C27B0,stroke:#6A1B9A,color:#fff
-    style Suggestions fill:#FF9800,stroke:#E65100,color:#fff
-    style Display fill:#00BCD4,stroke:#006064,color:#fff
-    style End fill:#4CAF50,stroke:#2E7D32,color:#fff
-
-**Example 3 - Backend API Flow:**
+_BACKEND_EXAMPLE = """**Example - Backend API Flow:**
 Use this Mermaid syntax (with triple backticks):
 graph TB
-    A[Client Request] -->|HTTP| B{{API Gateway}}
+    A[Client Request] -->|HTTP| B{API Gateway}
     B -->|Auth| C[Authentication]
     C -->|Valid| D[Business Logic]
     C -->|Invalid| E[Error Response]
@@ -233,7 +212,263 @@ graph TB
     style E fill:#ffebee
     style F fill:#e0f2f1
     style G fill:#fce4ec
-    style H fill:#e1f5fe
+    style H fill:#e1f5fe"""
+
+_FLOW_EXAMPLE = """**Example - Styled User Flow:**
+Use this Mermaid syntax (with triple backticks):
+flowchart TD
+    Start([User Login]) --> Survey[Takes Career Survey]
+    Survey --> Analysis[AI: Analyze Profile]
+    Analysis --> Suggestions[AI Career Suggestions<br/>3 Categories]
+    Suggestions --> Display[Display Results]
+    Display --> End([User Reviews])
+    
+    style Start fill:#4CAF50,stroke:#2E7D32,color:#fff
+    style Survey fill:#2196F3,stroke:#1565C0,color:#fff
+    style Analysis fill:#9C27B0,stroke:#6A1B9A,color:#fff
+    style Suggestions fill:#FF9800,stroke:#E65100,color:#fff
+    style Display fill:#00BCD4,stroke:#006064,color:#fff
+    style End fill:#4CAF50,stroke:#2E7D32,color:#fff"""
+
+
+def _badge_reference(stack_lower: List[str]) -> str:
+    """Badge lines for the detected technologies, in stack order without duplicates."""
+    badges = dict.fromkeys(_BADGE_TABLE[tech] for tech in stack_lower if tech in _BADGE_TABLE)
+    return '\n'.join(badges) if badges else _DEFAULT_BADGE
+
+
+def _diagram_example(stack_lower: List[str]) -> str:
+    """Pick the example Mermaid diagram closest to the detected topology."""
+    techs = set(stack_lower)
+    has_frontend = not _FRONTEND_TECHS.isdisjoint(techs)
+    has_server = not (_BACKEND_TECHS.isdisjoint(techs) and _DATABASE_TECHS.isdisjoint(techs))
+    
+    if has_frontend and has_server:
+        return _FULL_STACK_EXAMPLE
+    if has_server:
+        return _BACKEND_EXAMPLE
+    return _FLOW_EXAMPLE
+
+
+# Body of the template fallback README; _generate_enhanced_template fills
+# in the {named} fields with format_map
+_ENHANCED_README_TEMPLATE = """<div align="center">
+
+# {repo_name}
+
+{tagline}
+
+[![Stars](https://img.shields.io/badge/⭐_stars-{stars}-yellow)](https://github.com/{owner}/{repo_name})
+[![Forks](https://img.shields.io/badge/🍴_forks-{forks}-blue)](https://github.com/{owner}/{repo_name}/fork)
+[![License](https://img.shields.io/badge/📄_license-MIT-green)](LICENSE)
+
+[View Demo](https://github.com/{owner}/{repo_name}) · [Report Bug](https://github.com/{owner}/{repo_name}/issues) · [Request Feature](https://github.com/{owner}/{repo_name}/issues)
+
+</div>
+
+---
+
+## 📋 Table of Contents
+
+- [About](#about)
+- [Tech Stack](#tech-stack)
+- [Project Structure](#project-structure)
+- [Getting Started](#getting-started)
+- [Usage](#usage)
+- [Contributing](#contributing)
+- [License](#license)
+
+---
+
+## 🎯 About
+
+**{repo_name}** is maintained by **{owner}** and has gained **{stars} stars** from the community.
+
+This project leverages modern technologies to deliver a robust solution. With **{total_files} files** organized across multiple directories, it demonstrates professional software architecture and best practices.
+
+---
+
+## 🚀 Tech Stack
+
+{tech_list_md}
+
+---
+{arch_diagram}
+## 📁 Project Structure
+
+{file_tree}
+
+**Key Directories:**
+- Source code and main application logic
+- Configuration and build files
+- Documentation and resources
+
+---
+
+## 🛠️ Getting Started
+
+### Prerequisites
+
+Make sure you have the following installed:
+- {primary_lang}
+- Package manager ({package_manager})
+
+### Installation
+
+```bash
+# Clone the repository
+git clone {clone_url}
+
+# Navigate to project directory
+cd {repo_name}
+
+# Install dependencies
+{install_text}
+```
+
+---
+
+## 💻 Usage
+
+```bash
+# Run the application
+# Check the documentation for specific commands
+```
+
+For detailed usage instructions, please refer to the [documentation](https://github.com/{owner}/{repo_name}/wiki).
+
+---
+
+## 🤝 Contributing
+
+Contributions are what make the open source community amazing! Any contributions you make are **greatly appreciated**.
+
+1. Fork the Project
+2. Create your Feature Branch (`git checkout -b feature/AmazingFeature`)
+3. Commit your Changes (`git commit -m 'Add some AmazingFeature'`)
+4. Push to the Branch (`git push origin feature/AmazingFeature`)
+5. Open a Pull Request
+
+---
+
+## 📄 License
+
+Distributed under the MIT License. See `LICENSE` for more information.
+
+---
+
+## 🔗 Links
+
+- **Repository**: [{owner}/{repo_name}]({repo_link})
+- **Issues**: [Report a bug](https://github.com/{owner}/{repo_name}/issues)
+- **Discussions**: [Join the conversation](https://github.com/{owner}/{repo_name}/discussions)
+
+---
+
+## ⭐ Show Your Support
+
+Give a ⭐️ if this project helped you!
+
+---
+
+<div align="center">
+
+**[⬆ back to top](#{anchor})**
+
+Made with ❤️ by [{owner}](https://github.com/{owner})
+
+</div>
+"""
+
+# Architecture diagrams for _generate_architecture_diagram, keyed by
+# (layout, has_database); repositories without a backend get the default
+_ARCH_DIAGRAMS = {
+    ('full', True): """```mermaid
+graph TD
+    A[Client/Browser] -->|HTTP/HTTPS| B[Frontend]
+    B -->|API Calls| C[Backend Server]
+    C -->|Queries| D[Database]
+    C -->|Response| B
+    B -->|Render| A
+```""",
+    ('full', False): """```mermaid
+graph TD
+    A[Client/Browser] -->|HTTP/HTTPS| B[Frontend]
+    B -->|API Calls| C[Backend Server]
+    C -->|Response| B
+    B -->|Render| A
+```""",
+    ('backend', True): """```mermaid
+graph TD
+    A[Client] -->|Requests| B[Backend Server]
+    B -->|Queries| C[Database]
+    C -->|Data| B
+    B -->|Response| A
+```""",
+    ('backend', False): """```mermaid
+graph TD
+    A[Client] -->|Requests| B[Backend Server]
+    B -->|Response| A
+```"""
+}
+_DEFAULT_ARCH_DIAGRAM = """```mermaid
+graph TD
+    A[User] -->|Interacts| B[Application]
+    B -->|Processes| C[Core Logic]
+    C -->|Output| A
+```"""
+
+# A '#' line immediately followed by a non-blank, non-'#' line
+_HEADER_BLANKLINE_RE = re.compile(r'^(#[^\n]*)\n(?=[^\n#])', re.M)
+
+# Tone instructions
+_TONE_INSTRUCTIONS = {
+    'professional': 'Use a professional, technical tone suitable for enterprise documentation.',
+    'concise': 'Be brief and to-the-point. Use short sentences and bullet points.',
+    'enthusiastic': 'Use an enthusiastic, engaging tone that excites developers about the project.'
+}
+
+# Static skeleton of the README prompt; build_prompt fills in the {named} fields
+# with format_map, so literal braces are doubled as in an f-string
+_PROMPT_TEMPLATE = """You are an expert technical writer creating a beautiful, professional README.md for a GitHub repository.
+
+REPOSITORY INFORMATION:
+- Name: {name}
+- Owner: {owner}
+- Description: {description}
+- Stars: {stars}
+- Forks: {forks}
+- URL: {url}
+
+PROGRAMMING LANGUAGES:
+{languages_text}
+
+DETECTED TECH STACK:
+{tech_stack_text}
+
+PACKAGE MANIFESTS FOUND:
+{manifests_text}
+
+FILE STRUCTURE (Top Level):
+{file_structure_text}
+
+PROJECT STATISTICS:
+- Total Files: {total_files}
+- Total Directories: {total_dirs}
+- Max Depth: {max_depth}
+
+SETUP HINTS:
+{hints_text}
+
+INSTRUCTIONS:
+{tone_instruction}
+
+IMPORTANT - MERMAID ARCHITECTURE DIAGRAMS:
+You MUST create detailed, professional Mermaid diagrams that will render as VISUAL FLOWCHARTS.
+
+**CRITICAL: Use PROPER Mermaid syntax - diagrams will render as visual graphics on GitHub!**
+
+{diagram_example}
 
 **IMPORTANT STYLING RULES:**
 - Use `style NodeName fill:#COLOR` to add colors
@@ -245,44 +480,9 @@ graph TB
 Create a similar detailed, STYLED diagram based on the detected tech stack!
 
 IMPORTANT - TECHNOLOGY BADGE REFERENCE:
-Use these official shields.io badges for common technologies (use official logos, NOT emojis):
-
-**Frontend:**
-- ![React](https://img.shields.io/badge/React-20232A?style=for-the-badge&logo=react&logoColor=61DAFB)
-- ![Vue.js](https://img.shields.io/badge/Vue.js-35495E?style=for-the-badge&logo=vue.js&logoColor=4FC08D)
-- ![Angular](https://img.shields.io/badge/Angular-DD0031?style=for-the-badge&logo=angular&logoColor=white)
-- ![HTML5](https://img.shields.io/badge/HTML5-E34F26?style=for-the-badge&logo=html5&logoColor=white)
-- ![CSS3](https://img.shields.io/badge/CSS3-1572B6?style=for-the-badge&logo=css3&logoColor=white)
-- ![JavaScript](https://img.shields.io/badge/JavaScript-F7DF1E?style=for-the-badge&logo=javascript&logoColor=black)
-- ![TypeScript](https://img.shields.io/badge/TypeScript-007ACC?style=for-the-badge&logo=typescript&logoColor=white)
-- ![Tailwind CSS](https://img.shields.io/badge/Tailwind_CSS-38B2AC?style=for-the-badge&logo=tailwind-css&logoColor=white)
-
-**Backend:**
-- ![Node.js](https://img.shields.io/badge/Node.js-43853D?style=for-the-badge&logo=node.js&logoColor=white)
-- ![Python](https://img.shields.io/badge/Python-3776AB?style=for-the-badge&logo=python&logoColor=white)
-- ![Flask](https://img.shields.io/badge/Flask-000000?style=for-the-badge&logo=flask&logoColor=white)
-- ![Django](https://img.shields.io/badge/Django-092E20?style=for-the-badge&logo=django&logoColor=white)
-- ![Express.js](https://img.shields.io/badge/Express.js-404D59?style=for-the-badge&logo=express&logoColor=white)
-- ![FastAPI](https://img.shields.io/badge/FastAPI-005571?style=for-the-badge&logo=fastapi&logoColor=white)
-- ![Go](https://img.shields.io/badge/Go-00ADD8?style=for-the-badge&logo=go&logoColor=white)
-- ![Java](https://img.shields.io/badge/Java-ED8B00?style=for-the-badge&logo=openjdk&logoColor=white)
-- ![Ruby](https://img.shields.io/badge/Ruby-CC342D?style=for-the-badge&logo=ruby&logoColor=white)
-- ![PHP](https://img.shields.io/badge/PHP-777BB4?style=for-the-badge&logo=php&logoColor=white)
-
-**Database:**
-- ![PostgreSQL](https://img.shields.io/badge/PostgreSQL-316192?style=for-the-badge&logo=postgresql&logoColor=white)
-- ![MongoDB](https://img.shields.io/badge/MongoDB-4EA94B?style=for-the-badge&logo=mongodb&logoColor=white)
-- ![MySQL](https://img.shields.io/badge/MySQL-00000F?style=for-the-badge&logo=mysql&logoColor=white)
-- ![Redis](https://img.shields.io/badge/Redis-DC382D?style=for-the-badge&logo=redis&logoColor=white)
-- ![SQLite](https://img.shields.io/badge/SQLite-07405E?style=for-the-badge&logo=sqlite&logoColor=white)
-
-**DevOps & Tools:**
-- ![Docker](https://img.shields.io/badge/Docker-2496ED?style=for-the-badge&logo=docker&logoColor=white)
-- ![Kubernetes](https://img.shields.io/badge/Kubernetes-326CE5?style=for-the-badge&logo=kubernetes&logoColor=white)
-- ![Git](https://img.shields.io/badge/Git-F05032?style=for-the-badge&logo=git&logoColor=white)
-- ![GitHub](https://img.shields.io/badge/GitHub-100000?style=for-the-badge&logo=github&logoColor=white)
-- ![AWS](https://img.shields.io/badge/AWS-232F3E?style=for-the-badge&logo=amazon-aws&logoColor=white)
-- ![Firebase](https://img.shields.io/badge/Firebase-FFCA28?style=for-the-badge&logo=firebase&logoColor=black)
+Use these official shields.io badges for the detected technologies (use official logos, NOT emojis):
+
+{badge_reference}
 
 Use similar format for any other technologies detected. Find logo names at https://simpleicons.org/
 
@@ -307,25 +507,14 @@ Create a BEAUTIFUL, COMPREHENSIVE README.md with these requirements:
    - Use shields.io badges with official logos for each technology
    - Format: ![TechName](https://img.shields.io/badge/TechName-HexColor?style=for-the-badge&logo=techname&logoColor=white)
    - Group by category (Frontend, Backend, Database, DevOps, etc.)
-   - Examples:
-     * ![React](https://img.shields.io/badge/React-20232A?style=for-the-badge&logo=react&logoColor=61DAFB)
-     * ![Python](https://img.shields.io/badge/Python-3776AB?style=for-the-badge&logo=python&logoColor=white)
-     * ![JavaScript](https://img.shields.io/badge/JavaScript-F7DF1E?style=for-the-badge&logo=javascript&logoColor=black)
-     * ![TypeScript](https://img.shields.io/badge/TypeScript-007ACC?style=for-the-badge&logo=typescript&logoColor=white)
-     * ![Node.js](https://img.shields.io/badge/Node.js-43853D?style=for-the-badge&logo=node.js&logoColor=white)
-     * ![Flask](https://img.shields.io/badge/Flask-000000?style=for-the-badge&logo=flask&logoColor=white)
-     * ![PostgreSQL](https://img.shields.io/badge/PostgreSQL-316192?style=for-the-badge&logo=postgresql&logoColor=white)
-     * ![MongoDB](https://img.shields.io/badge/MongoDB-4EA94B?style=for-the-badge&logo=mongodb&logoColor=white)
-     * ![Docker](https://img.shields.io/badge/Docker-2496ED?style=for-the-badge&logo=docker&logoColor=white)
-     * ![HTML5](https://img.shields.io/badge/HTML5-E34F26?style=for-the-badge&logo=html5&logoColor=white)
-     * ![CSS3](https://img.shields.io/badge/CSS3-1572B6?style=for-the-badge&logo=css3&logoColor=white)
+   - Use the badge reference above for the detected technologies
    - Use appropriate colors and logos from https://simpleicons.org/
    - Make sure each technology has its official logo badge
 
 5. **Architecture** (REQUIRED - MUST BE VISUAL!):
    - **CRITICAL**: Create a BEAUTIFUL, STYLED Mermaid diagram that renders as a visual flowchart
    - Use `flowchart TD` or `graph TB` for best visual results
-   - **MUST include style definitions** for colored boxes (like the examples above)
+   - **MUST include style definitions** for colored boxes (like the example above)
    - Use descriptive labels with `<br/>` for multi-line text
    - Add edge labels with `|Label|` to show data flow
    - Create a comprehensive diagram showing:
@@ -387,7 +576,7 @@ FORMATTING REQUIREMENTS:
 - Use proper markdown syntax throughout
 - **CRITICAL**: Use official technology badges/icons for Tech Stack section (NOT emojis!)
 - **CRITICAL**: Include a BEAUTIFUL, STYLED, COLORED Mermaid architecture diagram (REQUIRED!)
-- **CRITICAL**: Architecture diagram MUST have style definitions with colors (see examples above)
+- **CRITICAL**: Architecture diagram MUST have style definitions with colors (see example above)
 - Use emojis for other sections (🚀 📦 🔧 💻 🎨 etc.) but NOT for technologies
 - Use code blocks with language tags
 - Mermaid diagrams MUST use:
@@ -406,24 +595,615 @@ FORMATTING REQUIREMENTS:
 
 Generate ONLY the markdown content. Make it professional, beautiful, and comprehensive with a STUNNING visual architecture diagram!
 """
+
+# One template per tone with its instruction already baked in
+_PROMPT_BY_TONE = {
+    tone: _PROMPT_TEMPLATE.replace('{tone_instruction}', instruction)
+    for tone, instruction in _TONE_INSTRUCTIONS.items()
+}
+
+
+class GeneratorError(Exception):
+    """Custom exception for generator errors."""
+    pass
+
+
+class READMEGenerator:
+    """Generates README content using external AI APIs."""
+    
+    # Default sections for README
+    DEFAULT_SECTIONS = [
+        'title', 'description', 'features', 'architecture',
+        'file_structure', 'tech_stack', 'setup', 'usage',
+        'api_endpoints', 'contributing'
+    ]
+    
+    # API Configuration - FREE TIER APIs
+    GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
+    GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+    GROQ_MODELS_URL = "https://api.groq.com/openai/v1/models"
+    GROQ_MODEL = "llama-3.3-70b-versatile"
+    
+    # Retry policy for throttled or failing Groq calls. Waits are bounded so a
+    # request stays well inside the gunicorn worker timeout; a longer
+    # Retry-After fails at once with the rate limit error.
+    RETRY_TOTAL = 2
+    RETRY_CONNECT = 2  # connection failures happen before the POST is sent, so are safe to retry
+    RETRY_BACKOFF = 1.5
+    RETRY_BACKOFF_MAX = 5.0
+    RETRY_JITTER = 0.5
+    RETRY_AFTER_MAX = 10.0
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    # Completions are reused for a week; the disk cache is capped at 256 MB
+    COMPLETION_TTL = 7 * 24 * 3600
+    COMPLETION_CACHE_BYTES = 256 * 1024 * 1024
+    
+    # Analyses whose formatted prompt fields are kept for reuse
+    FIELDS_CACHE_SIZE = 32
+    
+    def __init__(self):
+        """Initialize README generator."""
+        self.use_ai = bool(self.GROQ_API_KEY)
+        self._session: Optional['requests.Session'] = None
+        self._session_lock = threading.Lock()
+        self._aclient = None  # httpx.AsyncClient, created on first async call
+        
+        # Persistent prompt -> completion cache, opened on first API call; only
+        # enabled when GITREFINY_CACHE_DIR is set, like the analysis disk tier
+        cache_root = os.getenv('GITREFINY_CACHE_DIR')
+        self._completions_dir = os.path.join(cache_root, 'completions') if cache_root else None
+        self._completions = None
+        self._completions_lock = threading.Lock()
+        
+        # id(analysis) -> (analysis, formatted prompt fields), least recently used first
+        self._fields: OrderedDict = OrderedDict()
+        self._fields_lock = threading.Lock()
+        
+        # Open the TLS connection to Groq in the background so the first
+        # README request does not pay for the handshake
+        self._warmed = False
+        if self.use_ai:
+            threading.Thread(target=self._warm_connection, daemon=True).start()
+    
+    def _get_session(self) -> 'requests.Session':
+        """
+        Return the keep-alive session used for Groq calls, creating it on first use.
+        
+        Returns:
+            requests.Session with pooled HTTPS connections and default headers
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    requests = _get_requests()
+                    from requests.adapters import HTTPAdapter
+                    
+                    session = requests.Session()
+                    session.headers.update({
+                        "Authorization": f"Bearer {self.GROQ_API_KEY}",
+                        "Content-Type": "application/json"
+                    })
+                    # Honors Retry-After on 429/503 up to RETRY_AFTER_MAX; once retries
+                    # are exhausted the last response is returned and mapped to an
+                    # error below. Read errors are never retried: the completion may
+                    # already have run.
+                    retry = _bounded_retry_class(self.RETRY_AFTER_MAX)(
+                        total=self.RETRY_TOTAL,
+                        connect=self.RETRY_CONNECT,
+                        read=0,
+                        backoff_factor=self.RETRY_BACKOFF,
+                        backoff_max=self.RETRY_BACKOFF_MAX,
+                        backoff_jitter=self.RETRY_JITTER,
+                        status_forcelist=list(self.RETRY_STATUSES),
+                        allowed_methods=["POST"],
+                        respect_retry_after_header=True,
+                        raise_on_status=False
+                    )
+                    session.mount("https://", HTTPAdapter(
+                        pool_connections=4,
+                        pool_maxsize=4,
+                        max_retries=retry
+                    ))
+                    self._session = session
+        return self._session
+    
+    def _warm_connection(self) -> None:
+        """Establish a pooled connection to the Groq API ahead of the first call."""
+        with self._session_lock:
+            if self._warmed:
+                return
+            self._warmed = True
+        
+        try:
+            # Status and read retries are limited to POSTs, so only a failed connect is
+            # retried here (RETRY_CONNECT times), off the request path
+            response = self._get_session().get(self.GROQ_MODELS_URL, timeout=5)
+            response.close()
+            logger.debug("Groq connection warmed (status %s)", response.status_code)
+        except Exception as e:
+            logger.debug("Groq connection warm-up failed: %s", e)
+    
+    def _get_completion_cache(self):
+        """
+        Return the persistent completion cache, opening it on first use.
+        
+        Returns:
+            diskcache.Cache under the completions directory
+        """
+        if self._completions is None:
+            with self._completions_lock:
+                if self._completions is None:
+                    import diskcache
+                    self._completions = diskcache.Cache(
+                        self._completions_dir, size_limit=self.COMPLETION_CACHE_BYTES
+                    )
+        return self._completions
+    
+    def _cached_completion(self, key: str) -> Optional[str]:
+        """Look up a cached completion; a disabled or unusable cache counts as a miss."""
+        if self._completions_dir is None:
+            return None
+        try:
+            return self._get_completion_cache().get(key)
+        except Exception as e:
+            logger.warning("Completion cache unavailable: %s", e)
+            return None
+    
+    def _store_completion(self, key: str, content: str) -> None:
+        """Cache a completion; failures are logged and otherwise ignored."""
+        if self._completions_dir is None:
+            return
+        try:
+            self._get_completion_cache().set(key, content, expire=self.COMPLETION_TTL)
+        except Exception as e:
+            logger.warning("Completion cache unavailable: %s", e)
+    
+    def _call_groq_api(self, prompt: str, bypass_cache: bool = False) -> str:
+        """
+        Call Groq API with Llama 3 for README generation (FREE TIER).
+        
+        Args:
+            prompt: The prompt with repository analysis
+            bypass_cache: Always call the API, even if this exact request was answered before
+        
+        Returns:
+            Generated README markdown
+        """
+        if not self.GROQ_API_KEY:
+            raise GeneratorError("Groq API key not configured")
+        
+        data = self._build_payload(prompt)
+        key = self._cache_key(data)
+        
+        if not bypass_cache:
+            cached = self._cached_completion(key)
+            if cached is not None:
+                logger.info("Using cached Groq completion")
+                return cached
+        
+        requests = _get_requests()
+        
+        try:
+            logger.info("Calling Groq API with Llama 3.3 70B...")
+            # Serialize once with orjson when available; separate connect and read timeouts
+            body = _encode_json(data)
+            response = self._get_session().post(self.GROQ_API_URL, data=body, timeout=(5, 60))
+            
+            # Log response status
+            logger.debug("Groq API response status: %s", response.status_code)
+            
+            if response.status_code != 200:
+                self._raise_for_groq_status(response.status_code, response.text)
+            
+            result = _decode_json(response.content)
+            content = self._extract_content(result)
+            logger.info("Groq API success! Generated %d characters", len(content))
+            self._store_completion(key, content)
+            return content
+            
+        except requests.exceptions.Timeout:
+            raise GeneratorError("Groq API request timed out")
+        except requests.exceptions.ConnectionError:
+            raise GeneratorError("Failed to connect to Groq API. Check your internet connection.")
+        except requests.exceptions.RequestException as e:
+            raise GeneratorError(f"Groq API request failed: {str(e)}")
+        except KeyError as e:
+            raise GeneratorError(f"Groq API response missing expected field: {str(e)}")
+        except Exception as e:
+            raise GeneratorError(f"Groq API error: {str(e)}")
+    
+    def _stream_groq_api(self, prompt: str, bypass_cache: bool = False) -> Iterator[str]:
+        """
+        Call Groq API in streaming mode, yielding markdown as it is generated.
+        
+        Args:
+            prompt: The prompt with repository analysis
+            bypass_cache: Always call the API, even if this exact request was answered before
+        
+        Yields:
+            Chunks of generated README markdown
+        
+        Raises:
+            GeneratorError: If the request fails
+        """
+        if not self.GROQ_API_KEY:
+            raise GeneratorError("Groq API key not configured")
+        
+        data = self._build_payload(prompt)
+        key = self._cache_key(data)
+        
+        if not bypass_cache:
+            cached = self._cached_completion(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        requests = _get_requests()
+        data["stream"] = True
+        body = _encode_json(data)
+        parts = []
+        done = False
+        
+        try:
+            with self._get_session().post(self.GROQ_API_URL, data=body, timeout=(5, 60), stream=True) as response:
+                if response.status_code != 200:
+                    self._raise_for_groq_status(response.status_code, response.text)
+                
+                # Server-sent events: "data: {json}" lines, terminated by "data: [DONE]"
+                for line in response.iter_lines():
+                    if not line.startswith(b'data: '):
+                        continue
+                    
+                    chunk = line[len(b'data: '):]
+                    if chunk == b'[DONE]':
+                        done = True
+                        break
+                    
+                    choices = _decode_json(chunk).get('choices') or [{}]
+                    content = choices[0].get('delta', {}).get('content')
+                    if content:
+                        parts.append(content)
+                        yield content
+        except requests.exceptions.Timeout:
+            raise GeneratorError("Groq API request timed out")
+        except requests.exceptions.ConnectionError:
+            raise GeneratorError("Failed to connect to Groq API. Check your internet connection.")
+        except requests.exceptions.RequestException as e:
+            raise GeneratorError(f"Groq API request failed: {str(e)}")
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            # Undecodable or oddly shaped event data
+            raise GeneratorError(f"Groq API returned a malformed stream event: {str(e)}")
+        
+        # Only complete, non-empty streams are cached
+        if done and parts:
+            self._store_completion(key, ''.join(parts))
+    
+    def _build_payload(self, prompt: str) -> dict:
+        """
+        Build the chat completion request body for a README prompt.
+        
+        Args:
+            prompt: The prompt with repository analysis
+        
+        Returns:
+            JSON-serializable request body
+        """
+        return {
+            "model": self.GROQ_MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert technical writer who creates beautiful, comprehensive README files for GitHub repositories."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": 8000,
+            "temperature": 0.7
+        }
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """
+        Seconds to wait before retrying a throttled or failed async call.
+        
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            retry_after: Retry-After header value, if any
+        
+        Returns:
+            Delay in seconds; above RETRY_AFTER_MAX only when the server asked
+            for a longer wait than the retry budget allows
+        """
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        backoff = self.RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, self.RETRY_JITTER)
+        return min(backoff, self.RETRY_BACKOFF_MAX)
+    
+    def _cache_key(self, payload: dict) -> str:
+        """
+        Build the completion cache key for a request body.
+        
+        The key covers the model, both messages and the sampling parameters,
+        so changing any of them produces a fresh completion.
+        
+        Args:
+            payload: Request body from _build_payload
+        
+        Returns:
+            SHA-256 hex digest of the canonical JSON payload
+        """
+        import json
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def _raise_for_groq_status(self, status_code: int, error_detail: str) -> None:
+        """
+        Raise a descriptive error for a non-200 Groq API response.
+        
+        Args:
+            status_code: HTTP status code
+            error_detail: Response body
+        
+        Raises:
+            GeneratorError: Always
+        """
+        logger.error("Groq API error response: %s", error_detail)
+        
+        # Handle specific error codes
+        if status_code == 429:
+            raise GeneratorError("Groq API rate limit exceeded. Please wait a few minutes and try again.")
+        elif status_code == 401:
+            raise GeneratorError("Groq API key is invalid or expired. Please check your API key.")
+        elif status_code == 403:
+            raise GeneratorError("Groq API access forbidden. Please check your API key permissions.")
+        else:
+            raise GeneratorError(f"Groq API returned {status_code}: {error_detail}")
+    
+    def _extract_content(self, result: dict) -> str:
+        """
+        Extract the generated markdown from a chat completion response.
+        
+        Args:
+            result: Decoded response body
+        
+        Returns:
+            Generated content
+        
+        Raises:
+            GeneratorError: If the response has no choices
+        """
+        # Check if response has expected structure
+        if 'choices' not in result or not result['choices']:
+            raise GeneratorError(f"Groq API returned unexpected response structure: {result}")
+        
+        return result['choices'][0]['message']['content']
+    
+    def _get_async_client(self):
+        """
+        Return the HTTP/2 client used for concurrent Groq calls, creating it on first use.
+        
+        Returns:
+            httpx.AsyncClient bound to the running event loop
+        """
+        if self._aclient is None:
+            import httpx
+            self._aclient = httpx.AsyncClient(
+                http2=True,
+                headers={
+                    "Authorization": f"Bearer {self.GROQ_API_KEY}",
+                    "Content-Type": "application/json"
+                },
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._aclient
+    
+    async def _call_groq_api_async(self, prompt: str, bypass_cache: bool = False) -> str:
+        """
+        Call Groq API asynchronously for README generation.
+        
+        Args:
+            prompt: The prompt with repository analysis
+            bypass_cache: Always call the API, even if this exact request was answered before
+        
+        Returns:
+            Generated README markdown
+        
+        Raises:
+            GeneratorError: If the request fails
+        """
+        if not self.GROQ_API_KEY:
+            raise GeneratorError("Groq API key not configured")
+        
+        import asyncio
+        import httpx
+        
+        data = self._build_payload(prompt)
+        key = self._cache_key(data)
+        
+        # The disk cache blocks, so it is kept off the event loop
+        if not bypass_cache:
+            cached = await asyncio.to_thread(self._cached_completion, key)
+            if cached is not None:
+                return cached
+        
+        client = self._get_async_client()
+        body = _encode_json(data)
+        
+        for attempt in range(self.RETRY_TOTAL + 1):
+            try:
+                response = await client.post(self.GROQ_API_URL, content=body)
+            except httpx.TimeoutException:
+                raise GeneratorError("Groq API request timed out")
+            except httpx.ConnectError:
+                raise GeneratorError("Failed to connect to Groq API. Check your internet connection.")
+            except httpx.HTTPError as e:
+                raise GeneratorError(f"Groq API request failed: {str(e)}")
+            
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.RETRY_TOTAL:
+                break
+            
+            # Same policy as the sync session: Retry-After if given, else capped
+            # exponential backoff; a Retry-After past the budget fails now
+            delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+            if delay > self.RETRY_AFTER_MAX:
+                break
+            await asyncio.sleep(delay)
+        
+        if response.status_code != 200:
+            self._raise_for_groq_status(response.status_code, response.text)
+        
+        try:
+            result = _decode_json(response.content)
+            content = self._extract_content(result)
+        except KeyError as e:
+            raise GeneratorError(f"Groq API response missing expected field: {str(e)}")
+        
+        await asyncio.to_thread(self._store_completion, key, content)
+        return content
+    
+    async def invoke_ai_model_batch(self, prompts: List[str],
+                                    bypass_cache: bool = False) -> List[Union[str, Exception]]:
+        """
+        Generate READMEs for several prompts concurrently.
+        
+        Requests are multiplexed over HTTP/2, so the batch takes roughly as
+        long as its slowest prompt rather than the sum of all of them.
+        
+        Args:
+            prompts: Prompts to send
+            bypass_cache: Request fresh completions instead of reusing cached ones
+        
+        Returns:
+            Generated markdown or the raised exception, in prompt order
+        """
+        import asyncio
+        return await asyncio.gather(
+            *(self._call_groq_api_async(prompt, bypass_cache) for prompt in prompts),
+            return_exceptions=True
+        )
+    
+    def invoke_ai_model_batch_sync(self, prompts: List[str],
+                                   bypass_cache: bool = False) -> List[Union[str, Exception]]:
+        """
+        Blocking wrapper around invoke_ai_model_batch.
+        
+        Args:
+            prompts: Prompts to send
+            bypass_cache: Request fresh completions instead of reusing cached ones
+        
+        Returns:
+            Generated markdown or the raised exception, in prompt order
+        """
+        import asyncio
+        
+        async def run():
+            try:
+                return await self.invoke_ai_model_batch(prompts, bypass_cache)
+            finally:
+                # The client is bound to this event loop, which asyncio.run closes
+                await self.aclose()
+        
+        return asyncio.run(run())
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was created."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+    
+    def build_prompt(self, analysis: AnalysisResult, sections: Optional[List[str]] = None,
+                    tone: str = 'professional') -> str:
+        """
+        Build comprehensive AI prompt from analysis data.
+        
+        Args:
+            analysis: Repository analysis result
+            sections: List of sections to include (None = all)
+            tone: Tone for content (professional/concise/enthusiastic)
+        
+        Returns:
+            Formatted prompt string for AI
+        """
+        if sections is None:
+            sections = self.DEFAULT_SECTIONS
         
-        return prompt
+        template = _PROMPT_BY_TONE.get(tone, _PROMPT_BY_TONE['professional'])
+        
+        # Only the dynamic fields are formatted; the static skeleton is built once at import
+        return template.format_map(self._prompt_fields(analysis))
     
-    def _format_languages(self, languages: dict) -> str:
-        """Format language breakdown for prompt."""
-        if not languages:
-            return "Not detected"
+    def _prompt_fields(self, analysis: AnalysisResult) -> Dict[str, object]:
+        """
+        Format the analysis-dependent prompt fields, memoized per analysis.
+        
+        Building prompts for several tones or section sets from one analysis
+        sorts and joins its languages, stack and structure only once.
+        
+        Args:
+            analysis: Repository analysis result
         
-        sorted_langs = sorted(languages.items(), key=lambda x: x[1], reverse=True)
-        return '\n'.join([f"- {lang}: {pct:.1f}%" for lang, pct in sorted_langs])
+        Returns:
+            Mapping of prompt template field names to values
+        """
+        key = id(analysis)
+        with self._fields_lock:
+            entry = self._fields.get(key)
+            if entry is not None:
+                self._fields.move_to_end(key)
+                return entry[1]
+        
+        # Format languages with percentages
+        languages_text = ""
+        if analysis.languages:
+            top_langs = heapq.nlargest(5, analysis.languages.items(), key=itemgetter(1))
+            languages_text = "\n".join(f"- {lang}: {pct:.1f}%" for lang, pct in top_langs)
+        
+        stack_lower = [tech.lower() for tech in analysis.detected_stack]
+        
+        fields = {
+            'name': analysis.repo_meta.name,
+            'owner': analysis.repo_meta.owner,
+            'description': analysis.repo_meta.description,
+            'stars': analysis.repo_meta.stars,
+            'forks': analysis.repo_meta.forks,
+            'url': analysis.repo_meta.url,
+            'languages_text': languages_text,
+            'tech_stack_text': ", ".join(analysis.detected_stack) if analysis.detected_stack else "Not detected",
+            'manifests_text': ', '.join(analysis.package_manifests) if analysis.package_manifests else 'None',
+            'file_structure_text': "\n".join(analysis.file_tree_summary.top_level_structure[:20]),
+            'total_files': analysis.file_tree_summary.total_files,
+            'total_dirs': analysis.file_tree_summary.total_dirs,
+            'max_depth': analysis.file_tree_summary.max_depth,
+            'hints_text': '\n'.join(analysis.hints),
+            'badge_reference': _badge_reference(stack_lower),
+            'diagram_example': _diagram_example(stack_lower)
+        }
+        
+        with self._fields_lock:
+            # Keep the analysis alive alongside its entry so its id is not reused
+            self._fields[key] = (analysis, fields)
+            if len(self._fields) > self.FIELDS_CACHE_SIZE:
+                self._fields.popitem(last=False)
+        
+        return fields
     
-    def invoke_ai_model(self, prompt: str, model: str = 'Auto') -> str:
+    def invoke_ai_model(self, prompt: str, analysis: AnalysisResult, model: str = 'Auto',
+                        bypass_cache: bool = False) -> str:
         """
         Invoke external AI model to generate content.
         
         Args:
             prompt: Prompt for AI model
+            analysis: Analysis the prompt was built from, used by the template fallback
             model: Model to use ('Llama 3' or 'Auto')
+            bypass_cache: Request a fresh completion instead of reusing a cached one
         
         Returns:
             Generated markdown content
@@ -434,158 +1214,105 @@ Generate ONLY the markdown content. Make it professional, beautiful, and compreh
         # Try to use Groq API based on model selection
         if model == 'Llama 3' and self.GROQ_API_KEY:
             try:
-                print("Using Llama 3.3 70B (Groq) for README generation...")
-                return self._call_groq_api(prompt)
+                logger.info("Using Llama 3.3 70B (Groq) for README generation...")
+                return self._call_groq_api(prompt, bypass_cache)
             except Exception as e:
-                print(f"Groq API failed: {e}, falling back to template")
+                logger.error("Groq API failed: %s", e)
                 raise  # Re-raise to prevent silent fallback
         
         elif model == 'Auto':
             # Try Groq Llama 3 (most reliable and fast)
             if self.GROQ_API_KEY:
                 try:
-                    print("Auto mode: Using Llama 3.3 70B (Groq)...")
-                    return self._call_groq_api(prompt)
+                    logger.info("Auto mode: Using Llama 3.3 70B (Groq)...")
+                    return self._call_groq_api(prompt, bypass_cache)
                 except Exception as e:
-                    error_msg = f"Groq failed: {str(e)}"
-                    print(error_msg)
-                    print("Falling back to enhanced template...")
+                    logger.warning("Groq failed: %s; falling back to enhanced template", e)
         
         # Fallback to enhanced template if no API keys or all failed
-        print("Using enhanced template (no API key or API failed)...")
-        return self._generate_enhanced_template(prompt)
+        logger.info("Using enhanced template (no API key or API failed)...")
+        return self._generate_enhanced_template(analysis)
+    
+    def invoke_ai_model_stream(self, prompt: str, analysis: AnalysisResult,
+                               model: str = 'Auto', bypass_cache: bool = False) -> Iterator[str]:
+        """
+        Streaming variant of invoke_ai_model.
+        
+        In 'Auto' mode the template fallback is only used if Groq fails before
+        producing any output; a stream interrupted part-way raises instead.
+        
+        Args:
+            prompt: Prompt for AI model
+            analysis: Analysis the prompt was built from, used by the template fallback
+            model: Model to use ('Llama 3' or 'Auto')
+            bypass_cache: Request a fresh completion instead of reusing a cached one
+        
+        Yields:
+            Chunks of generated markdown content
+        
+        Raises:
+            GeneratorError: If generation fails
+        """
+        if model in ('Llama 3', 'Auto') and self.GROQ_API_KEY:
+            started = False
+            try:
+                for chunk in self._stream_groq_api(prompt, bypass_cache):
+                    started = True
+                    yield chunk
+                return
+            except GeneratorError as e:
+                logger.warning("Groq streaming failed: %s", e)
+                if model == 'Llama 3' or started:
+                    raise
+                logger.info("Falling back to enhanced template...")
+        
+        yield self._generate_enhanced_template(analysis)
     
-    def _generate_enhanced_template(self, prompt: str) -> str:
+    def _generate_enhanced_template(self, analysis: AnalysisResult) -> str:
         """
         Generate enhanced README using template with better formatting.
         This is a fallback when AI APIs are not available.
         
         Args:
-            prompt: Context from prompt
+            analysis: Repository analysis result
         
         Returns:
             Enhanced template-based README
         """
-        # Parse the prompt to extract information
-        lines = prompt.split('\n')
-        repo_name = "Repository"
-        owner = "owner"
-        description = ""
-        stars = 0
-        forks = 0
-        url = ""
-        languages = []
-        tech_stack = []
-        manifests = []
-        file_structure = []
-        total_files = 0
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if '- Name:' in line:
-                repo_name = line.split(':', 1)[1].strip()
-            elif '- Owner:' in line:
-                owner = line.split(':', 1)[1].strip()
-            elif '- Description:' in line:
-                description = line.split(':', 1)[1].strip()
-            elif '- Stars:' in line:
-                try:
-                    stars = int(line.split(':', 1)[1].strip())
-                except:
-                    pass
-            elif '- Forks:' in line:
-                try:
-                    forks = int(line.split(':', 1)[1].strip())
-                except:
-                    pass
-            elif '- URL:' in line:
-                url = line.split(':', 1)[1].strip()
-            elif 'PROGRAMMING LANGUAGES:' in line:
-                # Get next few lines for languages
-                for j in range(i+1, min(i+6, len(lines))):
-                    if lines[j].strip().startswith('-'):
-                        lang = lines[j].strip().split(':')[0].replace('-', '').strip()
-                        if lang:
-                            languages.append(lang)
-            elif 'DETECTED TECH STACK:' in line and i+1 < len(lines):
-                tech_line = lines[i+1].strip()
-                if tech_line and tech_line != 'Not detected':
-                    tech_stack = [t.strip() for t in tech_line.split(',')]
-            elif 'PACKAGE MANIFESTS FOUND:' in line and i+1 < len(lines):
-                manifest_line = lines[i+1].strip()
-                if manifest_line and manifest_line != 'None':
-                    manifests = [m.strip() for m in manifest_line.split(',')]
-            elif 'FILE STRUCTURE (Top Level):' in line:
-                for j in range(i+1, min(i+15, len(lines))):
-                    if lines[j].strip() and not lines[j].strip().startswith('PROJECT'):
-                        file_structure.append(lines[j].strip())
-                    else:
-                        break
-            elif '- Total Files:' in line:
-                try:
-                    total_files = int(line.split(':')[1].strip())
-                except:
-                    pass
-        
-        # Generate tech stack with emojis
-        tech_icons = {
-            'javascript': '🟨 JavaScript',
-            'typescript': '🔷 TypeScript',
-            'python': '🐍 Python',
-            'java': '☕ Java',
-            'go': '🐹 Go',
-            'rust': '🦀 Rust',
-            'ruby': '💎 Ruby',
-            'php': '🐘 PHP',
-            'html': '🌐 HTML',
-            'css': '🎨 CSS',
-            'react': '⚛️ React',
-            'vue': '💚 Vue.js',
-            'node': '🟢 Node.js',
-            'flask': '🌶️ Flask',
-            'django': '🎸 Django',
-            'postgres': '🐘 PostgreSQL',
-            'mongo': '🍃 MongoDB',
-            'docker': '🐳 Docker',
-        }
+        meta = analysis.repo_meta
+        repo_name = meta.name
+        owner = meta.owner
+        description = meta.description
+        url = meta.url
+        stars = meta.stars
+        forks = meta.forks
+        total_files = analysis.file_tree_summary.total_files
         
-        tech_list = []
-        for tech in (tech_stack + languages):
-            icon_found = False
-            for key, value in tech_icons.items():
-                if key in tech.lower():
-                    tech_list.append(value)
-                    icon_found = True
-                    break
-            if not icon_found:
-                tech_list.append(f"🔧 {tech}")
+        # Top five languages by share, as listed in the prompt
+        languages = heapq.nlargest(5, analysis.languages, key=analysis.languages.get)
+        tech_stack = analysis.detected_stack
+        manifests = analysis.package_manifests
+        file_structure = analysis.file_tree_summary.top_level_structure[:14]
         
         # Build file tree
-        tree_lines = ["```"]
-        tree_lines.append(f"{repo_name}/")
-        for i, item in enumerate(file_structure[:12]):
-            is_last = i == len(file_structure[:12]) - 1
-            prefix = "└── " if is_last else "├── "
-            tree_lines.append(prefix + item)
-        if len(file_structure) > 12:
-            tree_lines.append("└── ...")
-        tree_lines.append("```")
-        file_tree = "\n".join(tree_lines)
+        file_tree = _format_tree(file_structure, f"{repo_name}/", 12, "...")
         
         # Build installation commands
+        manifest_set = set(manifests)
         install_cmds = []
-        if any('package.json' in m for m in manifests):
+        if 'package.json' in manifest_set:
             install_cmds.append("npm install")
-        if any('requirements.txt' in m for m in manifests):
+        if 'requirements.txt' in manifest_set:
             install_cmds.append("pip install -r requirements.txt")
-        if any('go.mod' in m for m in manifests):
+        if 'go.mod' in manifest_set:
             install_cmds.append("go mod download")
         if not install_cmds:
             install_cmds = ["# See documentation for installation"]
         
         # Generate architecture diagram
-        has_frontend = any(t in str(tech_stack).lower() for t in ['react', 'vue', 'html', 'angular'])
-        has_backend = any(t in str(tech_stack).lower() for t in ['flask', 'django', 'express', 'node'])
+        stack_lower = {tech.lower() for tech in tech_stack}
+        has_frontend = not _FRONTEND_TECHS.isdisjoint(stack_lower)
+        has_backend = not _BACKEND_TECHS.isdisjoint(stack_lower)
         
         arch_diagram = ""
         if has_frontend or has_backend:
@@ -600,389 +1327,48 @@ graph LR
 ```
 """
         
-        # Generate beautiful README
-        readme = f"""<div align="center">
-
-# {repo_name}
-
-{description if description else f'A powerful {languages[0] if languages else "software"} project'}
-
-[![Stars](https://img.shields.io/badge/⭐_stars-{stars}-yellow)](https://github.com/{owner}/{repo_name})
-[![Forks](https://img.shields.io/badge/🍴_forks-{forks}-blue)](https://github.com/{owner}/{repo_name}/fork)
-[![License](https://img.shields.io/badge/📄_license-MIT-green)](LICENSE)
-
-[View Demo](https://github.com/{owner}/{repo_name}) · [Report Bug](https://github.com/{owner}/{repo_name}/issues) · [Request Feature](https://github.com/{owner}/{repo_name}/issues)
-
-</div>
-
----
-
-## 📋 Table of Contents
-
-- [About](#about)
-- [Tech Stack](#tech-stack)
-- [Project Structure](#project-structure)
-- [Getting Started](#getting-started)
-- [Usage](#usage)
-- [Contributing](#contributing)
-- [License](#license)
-
----
-
-## 🎯 About
-
-**{repo_name}** is maintained by **{owner}** and has gained **{stars} stars** from the community.
-
-This project leverages modern technologies to deliver a robust solution. With **{total_files} files** organized across multiple directories, it demonstrates professional software architecture and best practices.
-
----
-
-## 🚀 Tech Stack
-
-{chr(10).join(['- ' + tech for tech in tech_list[:10]])}
-
----
-{arch_diagram}
-## 📁 Project Structure
-
-{file_tree}
-
-**Key Directories:**
-- Source code and main application logic
-- Configuration and build files
-- Documentation and resources
-
----
-
-## 🛠️ Getting Started
-
-### Prerequisites
-
-Make sure you have the following installed:
-- {languages[0] if languages else 'Required runtime'}
-- Package manager ({manifests[0] if manifests else 'see documentation'})
-
-### Installation
-
-```bash
-# Clone the repository
-git clone {url if url else f'https://github.com/{owner}/{repo_name}.git'}
-
-# Navigate to project directory
-cd {repo_name}
-
-# Install dependencies
-{chr(10).join(install_cmds)}
-```
-
----
-
-## 💻 Usage
-
-```bash
-# Run the application
-# Check the documentation for specific commands
-```
-
-For detailed usage instructions, please refer to the [documentation](https://github.com/{owner}/{repo_name}/wiki).
-
----
-
-## 🤝 Contributing
-
-Contributions are what make the open source community amazing! Any contributions you make are **greatly appreciated**.
-
-1. Fork the Project
-2. Create your Feature Branch (`git checkout -b feature/AmazingFeature`)
-3. Commit your Changes (`git commit -m 'Add some AmazingFeature'`)
-4. Push to the Branch (`git push origin feature/AmazingFeature`)
-5. Open a Pull Request
-
----
-
-## 📄 License
-
-Distributed under the MIT License. See `LICENSE` for more information.
-
----
-
-## 🔗 Links
-
-- **Repository**: [{owner}/{repo_name}]({url if url else f'https://github.com/{owner}/{repo_name}'})
-- **Issues**: [Report a bug](https://github.com/{owner}/{repo_name}/issues)
-- **Discussions**: [Join the conversation](https://github.com/{owner}/{repo_name}/discussions)
-
----
-
-## ⭐ Show Your Support
-
-Give a ⭐️ if this project helped you!
-
----
-
-<div align="center">
-
-**[⬆ back to top](#{repo_name.lower()})**
-
-Made with ❤️ by [{owner}](https://github.com/{owner})
-
-</div>
-"""
-        
-        return readme
+        # Render the README in one pass over the module-level template
+        primary_lang = languages[0] if languages else None
+        repo_link = url if url else f'https://github.com/{owner}/{repo_name}'
+        return _ENHANCED_README_TEMPLATE.format_map({
+            'repo_name': repo_name,
+            'owner': owner,
+            'stars': stars,
+            'forks': forks,
+            'total_files': total_files,
+            'tagline': description if description else f'A powerful {primary_lang or "software"} project',
+            # Generate tech stack with emojis (only the ten shown are labelled)
+            'tech_list_md': "\n".join(
+                '- ' + _tech_label(tech) for tech in islice(chain(tech_stack, languages), 10)
+            ),
+            'arch_diagram': arch_diagram,
+            'file_tree': file_tree,
+            'primary_lang': primary_lang or 'Required runtime',
+            'package_manager': manifests[0] if manifests else 'see documentation',
+            'clone_url': url if url else f'{repo_link}.git',
+            'install_text': "\n".join(install_cmds),
+            'repo_link': repo_link,
+            'anchor': repo_name.lower()
+        })
     
     def _build_file_tree(self, structure: List[str]) -> str:
         """Build a proper file tree structure."""
         if not structure:
             return "```\n.\n├── src/\n├── tests/\n└── README.md\n```"
         
-        tree_lines = ["```"]
-        tree_lines.append(".")
-        
-        for i, item in enumerate(structure[:15]):  # Limit to 15 items
-            is_last = i == len(structure[:15]) - 1
-            prefix = "└── " if is_last else "├── "
-            tree_lines.append(prefix + item)
-        
-        if len(structure) > 15:
-            tree_lines.append("└── ... (and more)")
-        
-        tree_lines.append("```")
-        return "\n".join(tree_lines)
+        return _format_tree(structure, ".", 15, "... (and more)")
     
     def _generate_architecture_diagram(self, tech_stack: List[str], languages: Dict[str, float]) -> str:
         """Generate a Mermaid architecture diagram."""
         # Detect project type
-        has_frontend = any(tech in str(tech_stack).lower() for tech in ['react', 'vue', 'angular', 'html'])
-        has_backend = any(tech in str(tech_stack).lower() for tech in ['flask', 'django', 'express', 'node'])
-        has_database = any(tech in str(tech_stack).lower() for tech in ['postgres', 'mongo', 'redis', 'sql'])
-        
-        diagram = ["```mermaid", "graph TD"]
-        
-        if has_frontend and has_backend:
-            diagram.append("    A[Client/Browser] -->|HTTP/HTTPS| B[Frontend]")
-            diagram.append("    B -->|API Calls| C[Backend Server]")
-            if has_database:
-                diagram.append("    C -->|Queries| D[Database]")
-            diagram.append("    C -->|Response| B")
-            diagram.append("    B -->|Render| A")
-        elif has_backend:
-            diagram.append("    A[Client] -->|Requests| B[Backend Server]")
-            if has_database:
-                diagram.append("    B -->|Queries| C[Database]")
-                diagram.append("    C -->|Data| B")
-            diagram.append("    B -->|Response| A")
-        else:
-            diagram.append("    A[User] -->|Interacts| B[Application]")
-            diagram.append("    B -->|Processes| C[Core Logic]")
-            diagram.append("    C -->|Output| A")
-        
-        diagram.append("```")
-        return "\n".join(diagram)
-    
-    def _generate_template_readme(self, prompt: str) -> str:
-        """
-        Generate README using template with actual analysis data.
-        
-        Args:
-            prompt: Context from prompt containing analysis data
-        
-        Returns:
-            Customized README based on analysis
-        """
-        # Extract key info from prompt
-        lines = prompt.split('\n')
-        repo_name = "Repository"
-        owner = "owner"
-        description = ""
-        stars = 0
-        forks = 0
-        languages = []
-        tech_stack = []
-        manifests = []
-        hints = []
-        total_files = 0
-        top_level = []
-        
-        # Parse the prompt for actual data
-        in_languages = False
-        in_tech_stack = False
-        in_manifests = False
-        in_hints = False
-        in_structure = False
-        
-        for line in lines:
-            line = line.strip()
-            
-            if line.startswith('Repository:'):
-                repo_name = line.split(':', 1)[1].strip()
-            elif line.startswith('Owner:'):
-                owner = line.split(':', 1)[1].strip()
-            elif line.startswith('Description:'):
-                description = line.split(':', 1)[1].strip()
-            elif line.startswith('Stars:'):
-                try:
-                    stars = int(line.split(':', 1)[1].strip())
-                except:
-                    stars = 0
-            elif line.startswith('Forks:'):
-                try:
-                    forks = int(line.split(':', 1)[1].strip())
-                except:
-                    forks = 0
-            elif line.startswith('Languages:'):
-                in_languages = True
-                in_tech_stack = False
-                in_manifests = False
-                in_hints = False
-                in_structure = False
-            elif line.startswith('Tech Stack:'):
-                in_languages = False
-                in_tech_stack = True
-                in_manifests = False
-                in_hints = False
-                in_structure = False
-            elif line.startswith('Package Manifests:'):
-                in_languages = False
-                in_tech_stack = False
-                in_manifests = True
-                in_hints = False
-                in_structure = False
-            elif line.startswith('Setup Hints:'):
-                in_languages = False
-                in_tech_stack = False
-                in_manifests = False
-                in_hints = True
-                in_structure = False
-            elif line.startswith('File Structure'):
-                in_languages = False
-                in_tech_stack = False
-                in_manifests = False
-                in_hints = False
-                in_structure = True
-            elif line.startswith('Total Files:'):
-                try:
-                    total_files = int(line.split(':')[1].split()[0].strip())
-                except:
-                    pass
-            elif in_languages and line.startswith('-'):
-                lang = line.split(':')[0].replace('-', '').strip()
-                if lang:
-                    languages.append(lang)
-            elif in_tech_stack and line:
-                if line not in ['Not detected', '']:
-                    tech_stack.extend([t.strip() for t in line.split(',') if t.strip()])
-            elif in_manifests and line:
-                if line not in ['None', '']:
-                    manifests.extend([m.strip() for m in line.split(',') if m.strip()])
-            elif in_hints and line:
-                hints.append(line)
-            elif in_structure and line and not line.startswith('Total'):
-                top_level.append(line)
-        
-        # Build tech stack section
-        tech_stack_text = ""
-        if tech_stack:
-            tech_stack_text = "**Technologies:** " + ", ".join(set(tech_stack))
-        elif languages:
-            tech_stack_text = "**Languages:** " + ", ".join(languages[:5])
-        else:
-            tech_stack_text = "**Tech Stack:** Modern development tools"
-        
-        # Build installation section
-        install_commands = []
-        if 'package.json' in str(manifests):
-            install_commands.append("npm install")
-        if 'requirements.txt' in str(manifests):
-            install_commands.append("pip install -r requirements.txt")
-        if 'pyproject.toml' in str(manifests):
-            install_commands.append("poetry install")
-        if 'go.mod' in str(manifests):
-            install_commands.append("go mod download")
-        if 'Cargo.toml' in str(manifests):
-            install_commands.append("cargo build")
-        
-        if not install_commands:
-            install_commands = ["# See package manifest files for installation instructions"]
-        
-        # Build file structure
-        structure_text = "\n".join(top_level[:10]) if top_level else "├── src/\n├── tests/\n└── README.md"
-        
-        # Generate customized README
-        readme = f"""# {repo_name}
-
-{description if description else f'A {languages[0] if languages else "software"} project hosted on GitHub.'}
-
-![Stars](https://img.shields.io/badge/stars-{stars}-yellow) ![Forks](https://img.shields.io/badge/forks-{forks}-blue)
-
-## 📋 Overview
-
-This repository contains the source code for **{repo_name}**, maintained by **{owner}**.
-
-## 🚀 Tech Stack
-
-{tech_stack_text}
-
-{f"**Primary Languages:** {', '.join(languages[:3])}" if languages else ""}
-
-## 📦 Installation
-
-```bash
-# Clone the repository
-git clone https://github.com/{owner}/{repo_name}.git
-
-# Navigate to project directory
-cd {repo_name}
-
-# Install dependencies
-{chr(10).join(install_commands)}
-```
-
-## 📁 Project Structure
-
-```
-{structure_text}
-```
-
-{f"**Total Files:** {total_files}" if total_files > 0 else ""}
-
-## 🔧 Usage
-
-```bash
-# Run the application
-# Check the documentation for specific commands
-```
-
-## 🤝 Contributing
-
-Contributions are welcome! Please follow these steps:
-
-1. Fork the repository
-2. Create a feature branch (`git checkout -b feature/amazing-feature`)
-3. Commit your changes (`git commit -m 'Add amazing feature'`)
-4. Push to the branch (`git push origin feature/amazing-feature`)
-5. Open a Pull Request
-
-## 📄 License
-
-This project is open source. Please check the repository for license details.
-
-## 🔗 Links
-
-- **Repository:** https://github.com/{owner}/{repo_name}
-- **Issues:** https://github.com/{owner}/{repo_name}/issues
-- **Pull Requests:** https://github.com/{owner}/{repo_name}/pulls
-
-## ⭐ Show Your Support
-
-Give a ⭐️ if this project helped you!
-
----
-
-*Generated with [GitRefiny](https://github.com/yourusername/gitrefiny) - AI README Generator*
-"""
+        stack_lower = {tech.lower() for tech in tech_stack}
+        has_frontend = not _FRONTEND_TECHS.isdisjoint(stack_lower)
+        has_backend = not _BACKEND_TECHS.isdisjoint(stack_lower)
+        has_database = not _DATABASE_TECHS.isdisjoint(stack_lower)
         
-        return readme
+        if not has_backend:
+            return _DEFAULT_ARCH_DIAGRAM
+        return _ARCH_DIAGRAMS['full' if has_frontend else 'backend', has_database]
     
     def format_markdown(self, content: str) -> str:
         """
@@ -994,24 +1380,15 @@ Give a ⭐️ if this project helped you!
         Returns:
             Formatted markdown
         """
-        # Basic formatting: ensure proper line breaks
-        lines = content.split('\n')
-        formatted_lines = []
-        
-        for i, line in enumerate(lines):
-            formatted_lines.append(line)
-            
-            # Add extra line break after headers
-            if line.startswith('#') and i < len(lines) - 1:
-                if lines[i + 1] and not lines[i + 1].startswith('#'):
-                    formatted_lines.append('')
-        
-        return '\n'.join(formatted_lines)
+        # Basic formatting: add an extra line break after headers that are
+        # directly followed by text
+        return _HEADER_BLANKLINE_RE.sub(r'\1\n\n', content)
     
     def generate_readme(self, analysis: AnalysisResult, 
                        sections: Optional[List[str]] = None,
                        tone: str = 'professional',
-                       model: str = 'Auto') -> str:
+                       model: str = 'Auto',
+                       bypass_cache: bool = False) -> str:
         """
         Generate complete README from analysis.
         
@@ -1020,6 +1397,7 @@ Give a ⭐️ if this project helped you!
             sections: Sections to include (None = all)
             tone: Content tone
             model: AI model to use
+            bypass_cache: Generate a new README even if this prompt was answered before
         
         Returns:
             Generated markdown string
@@ -1032,7 +1410,7 @@ Give a ⭐️ if this project helped you!
             prompt = self.build_prompt(analysis, sections, tone)
             
             # Invoke AI model
-            markdown = self.invoke_ai_model(prompt, model)
+            markdown = self.invoke_ai_model(prompt, analysis, model, bypass_cache)
             
             # Format markdown
             formatted = self.format_markdown(markdown)
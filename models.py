@@ -2,9 +2,15 @@
 from dataclasses import dataclass, field
 from typing import Dict, List
 from datetime import datetime
+import sys
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters get regular
+# instance dicts (fields with defaults cannot be combined with a hand-written
+# __slots__ there)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class RepoMetadata:
     """Repository metadata from GitHub API."""
     name: str
@@ -16,7 +22,7 @@ class RepoMetadata:
     url: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FileTreeSummary:
     """Summary of repository file tree."""
     total_files: int
@@ -25,7 +31,7 @@ class FileTreeSummary:
     max_depth: int
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnalysisResult:
     """Complete repository analysis result."""
     repo_meta: RepoMetadata
@@ -61,7 +67,7 @@ class AnalysisResult:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ChatMessage:
     """Chat message structure."""
     role: str  # 'user' or 'assistant'
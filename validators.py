@@ -1,7 +1,11 @@
 """URL validation and parsing utilities for GitHub repositories."""
 import re
+from functools import lru_cache
 from typing import Tuple, Optional
 
+# Supports: https://github.com/owner/repo or github.com/owner/repo
+_GITHUB_URL_RE = re.compile(r'(?:https?://)?github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)')
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
@@ -28,14 +32,22 @@ def validate_github_url(url: str) -> Tuple[str, str]:
             "Invalid GitHub URL format. Expected: https://github.com/{owner}/{repo}"
         )
     
-    # Remove trailing slashes and whitespace
-    url = url.strip().rstrip('/')
+    return _match_github_url(url)
+
+
+@lru_cache(maxsize=256)
+def _match_github_url(url: str) -> Tuple[str, str]:
+    """
+    Match a non-empty URL string against the GitHub repository pattern.
     
-    # Pattern to match GitHub URLs
-    # Supports: https://github.com/owner/repo or github.com/owner/repo
-    pattern = r'^(?:https?://)?github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_.-]+)$'
+    Kept separate from validate_github_url so that only hashable strings
+    reach the cache; invalid URLs raise and are not cached.
     
-    match = re.match(pattern, url)
+    Raises:
+        ValidationError: If URL format is invalid
+    """
+    # Remove trailing slashes and whitespace
+    match = _GITHUB_URL_RE.fullmatch(url.strip().rstrip('/'))
     
     if not match:
         raise ValidationError(
@@ -46,10 +58,7 @@ def validate_github_url(url: str) -> Tuple[str, str]:
     owner, repo = match.groups()
     
     # Remove .git suffix if present
-    if repo.endswith('.git'):
-        repo = repo[:-4]
-    
-    return owner, repo
+    return owner, repo.removesuffix('.git')
 
 
 def parse_github_url(url: str) -> Optional[dict]:
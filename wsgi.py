@@ -0,0 +1,8 @@
+"""WSGI entrypoint for GitRefiny.
+
+Run in production with gunicorn's threaded workers so that IO-bound GitHub
+and Groq calls from different clients overlap:
+
+    gunicorn -w 4 -k gthread --threads 8 --timeout 60 wsgi:app
+"""
+from app import app